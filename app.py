@@ -6,16 +6,23 @@ Enhanced for maximum compatibility and features.
 """
 
 import os
-import uuid
+import time
+import secrets
 import logging
+import functools
+import gzip
+import threading
+import queue
+import atexit
 import subprocess
 import json
 import requests
+from urllib.parse import quote
 from datetime import datetime
-from pathlib import Path
-from flask import Flask, request, jsonify, send_file, render_template, flash, redirect, url_for
+from flask import Flask, Request, request, session, jsonify, send_file, render_template, flash, redirect, url_for
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
+from logging.handlers import QueueHandler, QueueListener
 
 # Import our custom modules
 from config import Config
@@ -23,45 +30,142 @@ from utils.file_handler import FileHandler
 from utils.converter import FileConverter
 from utils.validators import FileValidator
 from utils.cleanup import CleanupManager
+from utils.job_queue import JobQueue
+from utils.conversion_cache import ConversionCache
+from utils.conversion_pool import ConversionPool
+from utils.html_pdf_worker import HtmlPdfWorker
+from utils.json_provider import OrjsonProvider
+
+# Configure logging: request threads only enqueue records and a single
+# listener thread does the actual file and console writes
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler('app.log'),
+    logging.StreamHandler()
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+queue_handler = QueueHandler(queue.SimpleQueue())
+root_logger = logging.getLogger()
+root_logger.setLevel(Config.LOG_LEVEL.upper())
+root_logger.addHandler(queue_handler)
+
+def start_log_listener():
+    """Start the thread that drains queued log records into the real handlers"""
+    global log_listener
+    # Threads do not survive fork(), so forked workers get a fresh queue and listener
+    queue_handler.queue = queue.SimpleQueue()
+    log_listener = QueueListener(queue_handler.queue, *log_handlers)
+    log_listener.start()
+
+start_log_listener()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(lambda: log_listener.stop())
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', template_folder='Templates')
 app.config.from_object(Config)
+# jsonify and app.json serialize with orjson when it is installed
+app.json = OrjsonProvider(app)
+
+# Folder prefixes resolved once for building per-request paths
+CONVERTED_DIR = os.fspath(Config.CONVERTED_FOLDER).rstrip('/\\') + os.sep
+UPLOAD_DIR = os.fspath(Config.UPLOAD_FOLDER).rstrip('/\\') + os.sep
 
 # Initialize components
 file_handler = FileHandler()
 converter = FileConverter()
 validator = FileValidator()
 cleanup_manager = CleanupManager()
+job_queue = JobQueue()
+conversion_cache = ConversionCache()
+conversion_pool = ConversionPool(converter)
+atexit.register(conversion_pool.shutdown)
+
+class UploadRequest(Request):
+    """Request that spools uploaded files into the upload folder"""
+    
+    # Non-file form fields are only a few short options; don't buffer more
+    max_form_memory_size = Config.MAX_FORM_MEMORY_SIZE
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return file_handler.create_upload_spool(total_content_length)
+
+app.request_class = UploadRequest
 
 # Start cleanup thread
 cleanup_manager.start_cleanup_thread()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=cleanup_manager.reset_after_fork)
+# Only stop the thread at exit; a sweep here would delay every worker recycle
+atexit.register(cleanup_manager.stop_cleanup_thread)
+
+def new_unique_id():
+    """Return a random 128-bit hex token for naming an upload"""
+    # Has no underscores, so "<unique_id>_<name>" splits unambiguously
+    return secrets.token_hex(16)
+
+@functools.lru_cache(maxsize=None)
+def static_file_version(filename):
+    """Cache-busting token for a static file, from its modification time"""
+    try:
+        return int(os.stat(os.path.join(app.static_folder, filename)).st_mtime)
+    except OSError:
+        return None
+
+@app.url_defaults
+def add_static_file_version(endpoint, values):
+    """Version static URLs so they can be cached for SEND_FILE_MAX_AGE_DEFAULT"""
+    if endpoint == 'static' and 'filename' in values:
+        version = static_file_version(values['filename'])
+        if version is not None:
+            values.setdefault('v', version)
+
+def minify_html(html):
+    """Drop indentation and blank lines from rendered HTML"""
+    # Line breaks are kept so inline scripts still parse the same; the
+    # templates have no <pre> blocks or multi-line string literals
+    return '\n'.join(stripped for stripped in (line.strip() for line in html.splitlines()) if stripped)
+
+@functools.lru_cache(maxsize=None)
+def prerendered_page(template_name):
+    """Rendered body of a page with no per-request content, plain and gzipped"""
+    body = minify_html(render_template(template_name)).encode('utf-8')
+    return body, gzip.compress(body, compresslevel=9)
+
+def render_static_page(template_name):
+    """Serve a page from its pre-rendered, pre-compressed copy when possible"""
+    # Flashed messages differ per visitor, and reloading templates needs a fresh render
+    if app.jinja_env.auto_reload or session.get('_flashes'):
+        return render_template(template_name)
+    
+    body, gzipped = prerendered_page(template_name)
+    if request.accept_encodings['gzip']:
+        response = app.response_class(gzipped, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(body, mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/')
 def index():
     """Main page with enhanced UI"""
-    return render_template('index.html')
+    return render_static_page('index.html')
 
 @app.route('/about')
 def about():
     """About page"""
-    return render_template('about.html')
+    return render_static_page('about.html')
 
 @app.route('/html-to-pdf')
 def html_to_pdf():
     """HTML to PDF converter page"""
-    return render_template('html_to_pdf.html')
+    return render_static_page('html_to_pdf.html')
 
 @app.route('/api/html-to-pdf', methods=['POST'])
 def api_html_to_pdf():
@@ -88,7 +192,7 @@ def api_html_to_pdf():
         
         # Generate unique filename
         filename = f"html_converted_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        output_path = os.path.join(app.config['CONVERTED_FOLDER'], filename)
+        output_path = f"{CONVERTED_DIR}{filename}"
         
         # Call the Node.js converter
         result = convert_html_to_pdf_via_nodejs(html_content, output_path, {
@@ -118,8 +222,31 @@ def api_html_to_pdf():
             'error': f'Conversion failed: {str(e)}'
         }), 500
 
+# HTML to PDF renders in a headless browser; cap how many run at once
+html_to_pdf_slots = threading.BoundedSemaphore(Config.HTML_TO_PDF_LIMIT)
+html_pdf_worker = HtmlPdfWorker(os.path.join(os.path.dirname(__file__), 'html_converter'))
+atexit.register(html_pdf_worker.stop)
+
 def convert_html_to_pdf_via_nodejs(html_content, output_path, options):
     """Convert HTML to PDF using the Node.js converter"""
+    with html_to_pdf_slots:
+        if Config.HTML_TO_PDF_PERSISTENT:
+            try:
+                return html_pdf_worker.convert(html_content, output_path, {
+                    'format': options.get('format', 'A4'),
+                    'landscape': bool(options.get('landscape', False)),
+                    'margin': {'top': '12mm', 'right': '10mm', 'bottom': '14mm', 'left': '10mm'},
+                    'scale': 1.0,
+                    'letterhead': True,
+                    'letterheadType': options.get('letterheadType', 'trivanta')
+                })
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"HTML to PDF worker unavailable, converting in a one-off process: {str(e)}")
+        
+        return run_html_converter_once(html_content, output_path, options)
+
+def run_html_converter_once(html_content, output_path, options):
+    """Convert HTML to PDF in a fresh Node.js process"""
     try:
         # Path to the Node.js converter
         converter_path = os.path.join(os.path.dirname(__file__), 'html_converter', 'converter.js')
@@ -174,7 +301,7 @@ def convert_html_to_pdf_via_nodejs(html_content, output_path, options):
             cwd=os.path.join(os.path.dirname(__file__), 'html_converter'),
             capture_output=True,
             text=True,
-            timeout=60
+            timeout=Config.HTML_TO_PDF_TIMEOUT
         )
         
         if result.returncode == 0:
@@ -203,6 +330,65 @@ def convert_html_to_pdf_via_nodejs(html_content, output_path, options):
             'error': str(e)
         }
 
+def filename_stem(filename):
+    """Return a filename without its last extension"""
+    return filename.rpartition('.')[0] or filename
+
+def describe_converted_file(filename):
+    """Return the path, download name and stat result (None if missing) of a converted file"""
+    file_path = f"{CONVERTED_DIR}{filename}"
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        stat_result = None
+    
+    # Strip the "<unique_id>_converted_" prefix to recover the user-facing name
+    original_name = filename.split('_converted_', 1)[-1]
+    return file_path, original_name, stat_result
+
+def converter_settings(image_quality, pdf_resolution, optimize):
+    """Per-request converter settings from the advanced options fields"""
+    settings = {}
+    if image_quality.isdigit():
+        settings['image_quality'] = int(image_quality)
+    if pdf_resolution.isdigit():
+        settings['pdf_resolution'] = int(pdf_resolution)
+    if optimize.lower() in ('1', 'true', 'on'):
+        settings['optimize'] = True
+    return settings
+
+def run_conversion(input_path, output_path, target_format, input_digest=None, **settings):
+    """Convert an uploaded file, drop the input and schedule the output for cleanup"""
+    cache_key = None
+    if conversion_cache.enabled:
+        cache_key = conversion_cache.make_key(
+            input_path, target_format,
+            settings.get('image_quality', converter.image_quality),
+            settings.get('pdf_resolution', converter.pdf_resolution),
+            settings.get('optimize', converter.optimize_images),
+            input_digest=input_digest
+        )
+    
+    try:
+        if cache_key and conversion_cache.fetch(cache_key, output_path):
+            conversion_result = {'success': True, 'output_path': output_path}
+        else:
+            conversion_result = conversion_pool.convert(input_path, output_path, target_format, **settings)
+            if cache_key and conversion_result['success']:
+                conversion_cache.store(cache_key, output_path)
+    finally:
+        # The input is no longer needed whether or not the conversion worked,
+        # even if the converter raised
+        file_handler.delete_file(input_path)
+    
+    if conversion_result['success']:
+        cleanup_manager.schedule_cleanup(output_path)
+    else:
+        # A failed converter may have left a partial file behind
+        file_handler.delete_file(output_path)
+    
+    return conversion_result
+
 @app.route('/api/upload', methods=['POST'])
 def api_upload():
     """Enhanced API endpoint for file upload and conversion"""
@@ -220,6 +406,7 @@ def api_upload():
         # Get advanced options
         image_quality = request.form.get('image_quality', '85')
         pdf_resolution = request.form.get('pdf_resolution', '300')
+        optimize = request.values.get('optimize', '')
         
         # Validate input
         if file.filename == '':
@@ -237,27 +424,25 @@ def api_upload():
         # Debug logging
         logger.info(f"Received file: {file.filename}")
         logger.info(f"Target format: {target_format}")
-        logger.info(f"Form data: {dict(request.form)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Form data: {dict(request.form)}")
         
         # Validate file
         if not validator.is_allowed_file(file.filename):
-            supported_formats = validator.get_supported_formats()
-            format_list = []
-            for category, formats in supported_formats.items():
-                format_list.extend(formats)
             logger.error(f"File type not supported: {file.filename}")
             return jsonify({
                 'success': False,
-                'error': f'File type not supported. Allowed types: {", ".join(sorted(set(format_list)))}'
+                'error': f'File type not supported. Allowed types: {validator.get_supported_formats_text()}'
             }), 400
         
         # Generate unique filename
-        unique_id = str(uuid.uuid4())
+        unique_id = new_unique_id()
         original_filename = secure_filename(file.filename)
         input_filename = f"{unique_id}_{original_filename}"
         
         # Save uploaded file
         input_path = file_handler.save_uploaded_file(file, input_filename)
+        input_digest = file_handler.upload_digest(file)
         
         # Enhanced file validation
         logger.info(f"Validating file: {input_path}")
@@ -270,34 +455,39 @@ def api_upload():
             return jsonify({
                 'success': False,
                 'error': validation_result['error']
-            }), 400
+            }), validation_result.get('status_code', 400)
         
         # Generate output filename
-        output_filename = f"{unique_id}_converted_{Path(original_filename).stem}.{target_format}"
-        output_path = os.path.join(Config.CONVERTED_FOLDER, output_filename)
+        output_filename = f"{unique_id}_converted_{filename_stem(original_filename)}.{target_format}"
+        output_path = f"{CONVERTED_DIR}{output_filename}"
         
-        # Update converter settings with advanced options
-        if image_quality.isdigit():
-            converter.image_quality = int(image_quality)
-        if pdf_resolution.isdigit():
-            converter.pdf_resolution = int(pdf_resolution)
+        # Advanced options apply to this conversion only; the converter is shared
+        settings = converter_settings(image_quality, pdf_resolution, optimize)
         
         # Perform conversion
         logger.info(f"Starting conversion: {original_filename} -> {target_format}")
-        logger.info(f"Input path: {input_path}")
-        logger.info(f"Output path: {output_path}")
-        logger.info(f"Input file exists: {os.path.exists(input_path)}")
-        logger.info(f"Input file size: {os.path.getsize(input_path) if os.path.exists(input_path) else 'N/A'}")
-        conversion_result = converter.convert_file(input_path, output_path, target_format)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Only stat the saved upload when someone is going to read the result
+            logger.debug(f"Input path: {input_path} ({os.stat(input_path).st_size} bytes)")
+            logger.debug(f"Output path: {output_path}")
+        
+        # Queue the conversion and answer straight away when the client asked for a job
+        if request.form.get('async', '').lower() in ('1', 'true', 'yes'):
+            job_queue.submit(unique_id, run_conversion, input_path, output_path, target_format, input_digest, **settings, metadata={
+                'filename': output_filename,
+                'original_filename': original_filename,
+                'target_format': target_format
+            })
+            return jsonify({
+                'success': True,
+                'job_id': unique_id,
+                'status_url': url_for('get_job_status', job_id=unique_id)
+            }), 202
+        
+        conversion_result = run_conversion(input_path, output_path, target_format, input_digest, **settings)
         logger.info(f"Conversion result: {conversion_result}")
         
         if conversion_result['success']:
-            # Clean up input file
-            file_handler.delete_file(input_path)
-            
-            # Schedule cleanup of output file
-            cleanup_manager.schedule_cleanup(output_path)
-            
             download_url = url_for('download_file', filename=output_filename)
             
             logger.info(f"Conversion successful: {output_filename}")
@@ -310,8 +500,6 @@ def api_upload():
                 'file_size': validation_result.get('file_size', 0)
             })
         else:
-            # Clean up input file on conversion failure
-            file_handler.delete_file(input_path)
             return jsonify({
                 'success': False,
                 'error': conversion_result.get('error', 'Conversion failed')
@@ -329,14 +517,66 @@ def api_upload():
             'error': f'Server error: {str(e)}'
         }), 500
 
+@app.route('/api/status/<job_id>')
+def get_job_status(job_id):
+    """API endpoint to poll a queued conversion"""
+    try:
+        status = job_queue.get_status(job_id)
+        
+        if status is None:
+            # Jobs are tracked by the worker that accepted the upload; any other
+            # worker can still report a finished job from its output file
+            filename = file_handler.find_converted_file(job_id)
+            if filename is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Job not found'
+                }), 404
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'state': 'finished',
+                'filename': filename,
+                'download_url': url_for('download_file', filename=filename)
+            })
+        
+        response = {
+            'success': True,
+            'job_id': job_id,
+            'state': status['state']
+        }
+        
+        if status['state'] == 'finished':
+            metadata = status['metadata']
+            response.update({
+                'filename': metadata['filename'],
+                'original_filename': metadata['original_filename'],
+                'target_format': metadata['target_format'],
+                'download_url': url_for('download_file', filename=metadata['filename'])
+            })
+        elif status['state'] == 'failed':
+            response['error'] = status['error']
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        logger.error(f"Job status API error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def render_upload_error(message, status_code):
+    """Re-render the upload page with an error instead of flashing and redirecting"""
+    return render_template('index.html', error=message), status_code
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Enhanced form-based file upload endpoint"""
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
-            flash('No file selected', 'error')
-            return redirect(request.url)
+            return render_upload_error('No file selected', 400)
         
         file = request.files['file']
         target_format = request.form.get('target_format', '').lower()
@@ -344,96 +584,85 @@ def upload_file():
         # Get advanced options
         image_quality = request.form.get('image_quality', '85')
         pdf_resolution = request.form.get('pdf_resolution', '300')
+        optimize = request.values.get('optimize', '')
         
         # Validate input
         if file.filename == '':
-            flash('No file selected', 'error')
-            return redirect(request.url)
+            return render_upload_error('No file selected', 400)
         
         if not target_format:
-            flash('Please select a target format', 'error')
-            return redirect(request.url)
+            return render_upload_error('Please select a target format', 400)
         
         # Validate file
         if not validator.is_allowed_file(file.filename):
-            supported_formats = validator.get_supported_formats()
-            format_list = []
-            for category, formats in supported_formats.items():
-                format_list.extend(formats)
-            flash(f'File type not supported. Allowed types: {", ".join(sorted(set(format_list)))}', 'error')
-            return redirect(request.url)
+            return render_upload_error(f'File type not supported. Allowed types: {validator.get_supported_formats_text()}', 400)
         
         # Generate unique filename
-        unique_id = str(uuid.uuid4())
+        unique_id = new_unique_id()
         original_filename = secure_filename(file.filename)
         input_filename = f"{unique_id}_{original_filename}"
         
         # Save uploaded file
         input_path = file_handler.save_uploaded_file(file, input_filename)
+        input_digest = file_handler.upload_digest(file)
         
         # Enhanced file validation
         validation_result = validator.validate_file(input_path, original_filename)
         if not validation_result['valid']:
             # Clean up invalid file
             file_handler.delete_file(input_path)
-            flash(validation_result['error'], 'error')
-            return redirect(request.url)
+            return render_upload_error(validation_result['error'], validation_result.get('status_code', 400))
         
         # Generate output filename
-        output_filename = f"{unique_id}_converted_{Path(original_filename).stem}.{target_format}"
-        output_path = os.path.join(Config.CONVERTED_FOLDER, output_filename)
+        output_filename = f"{unique_id}_converted_{filename_stem(original_filename)}.{target_format}"
+        output_path = f"{CONVERTED_DIR}{output_filename}"
         
-        # Update converter settings with advanced options
-        if image_quality.isdigit():
-            converter.image_quality = int(image_quality)
-        if pdf_resolution.isdigit():
-            converter.pdf_resolution = int(pdf_resolution)
+        # Advanced options apply to this conversion only; the converter is shared
+        settings = converter_settings(image_quality, pdf_resolution, optimize)
         
         # Perform conversion
         logger.info(f"Starting conversion: {original_filename} -> {target_format}")
-        conversion_result = converter.convert_file(input_path, output_path, target_format)
+        conversion_result = run_conversion(input_path, output_path, target_format, input_digest, **settings)
         
         if conversion_result['success']:
-            # Clean up input file
-            file_handler.delete_file(input_path)
-            
-            # Schedule cleanup of output file
-            cleanup_manager.schedule_cleanup(output_path)
-            
             # Redirect to success page
             flash(f'File converted successfully! Original: {original_filename} -> {target_format.upper()}', 'success')
             return redirect(url_for('success', filename=output_filename))
         else:
-            # Clean up input file on conversion failure
-            file_handler.delete_file(input_path)
-            flash(f'Conversion failed: {conversion_result.get("error", "Unknown error")}', 'error')
-            return redirect(request.url)
+            return render_upload_error(f'Conversion failed: {conversion_result.get("error", "Unknown error")}', 500)
             
     except RequestEntityTooLarge:
-        flash('File too large. Maximum file size is 100MB.', 'error')
-        return redirect(request.url)
+        return render_upload_error('File too large. Maximum file size is 100MB.', 413)
     except Exception as e:
         logger.error(f"Upload error: {str(e)}")
-        flash(f'Server error: {str(e)}', 'error')
-        return redirect(request.url)
+        return render_upload_error(f'Server error: {str(e)}', 500)
 
 @app.route('/download/<filename>')
 def download_file(filename):
     """Download converted file"""
     try:
-        file_path = os.path.join(Config.CONVERTED_FOLDER, filename)
+        file_path, original_name, stat_result = describe_converted_file(filename)
         
-        if not os.path.exists(file_path):
+        if stat_result is None:
             return "File not found", 404
         
-        # Get original filename for download
-        original_name = filename.split('_converted_', 1)[-1] if '_converted_' in filename else filename
+        # Behind nginx, hand the transfer to the proxy so no bytes pass through Python
+        if Config.X_ACCEL_REDIRECT_PREFIX:
+            response = app.response_class(mimetype='application/octet-stream')
+            response.headers['X-Accel-Redirect'] = f"{Config.X_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(filename)}"
+            response.headers.set('Content-Disposition', 'attachment', filename=original_name)
+            return response
         
+        # Passing the path (not an open file) lets the WSGI server's file
+        # wrapper use sendfile(2); conditional responses enable resumable ranges
         return send_file(
             file_path,
             as_attachment=True,
             download_name=original_name,
-            mimetype='application/octet-stream'
+            mimetype='application/octet-stream',
+            conditional=True,
+            etag=True,
+            max_age=0
         )
         
     except Exception as e:
@@ -444,19 +673,15 @@ def download_file(filename):
 def success(filename):
     """Success page after conversion"""
     try:
-        file_path = os.path.join(Config.CONVERTED_FOLDER, filename)
+        file_path, original_name, stat_result = describe_converted_file(filename)
         
-        if not os.path.exists(file_path):
+        if stat_result is None:
             return "File not found", 404
         
-        # Get file info
-        file_size = os.path.getsize(file_path)
-        original_name = filename.split('_converted_', 1)[-1] if '_converted_' in filename else filename
-        
         return render_template('success.html', 
                              filename=filename,
                              original_name=original_name,
-                             file_size=file_size,
+                             file_size=stat_result.st_size,
                              download_url=url_for('download_file', filename=filename))
         
     except Exception as e:
@@ -479,15 +704,27 @@ def get_formats():
             'error': str(e)
         }), 500
 
+@functools.lru_cache(maxsize=64)
+def format_info_json(extension):
+    """Serialized /api/format-info payload (format tables never change at runtime)"""
+    return app.json.dumps({
+        'success': True,
+        'format_info': validator.get_format_info(extension)
+    })
+
+@functools.lru_cache(maxsize=64)
+def conversion_options_json(input_format):
+    """Serialized /api/conversion-options payload (format tables never change at runtime)"""
+    return app.json.dumps({
+        'success': True,
+        'options': converter.get_conversion_options(input_format)
+    })
+
 @app.route('/api/format-info/<extension>')
 def get_format_info(extension):
     """API endpoint to get format information"""
     try:
-        format_info = validator.get_format_info(extension)
-        return jsonify({
-            'success': True,
-            'format_info': format_info
-        })
+        return app.response_class(format_info_json(extension.lower()), mimetype='application/json')
     except Exception as e:
         logger.error(f"Format info API error: {str(e)}")
         return jsonify({
@@ -499,11 +736,7 @@ def get_format_info(extension):
 def get_conversion_options(input_format):
     """API endpoint to get conversion options for a format"""
     try:
-        options = converter.get_conversion_options(input_format)
-        return jsonify({
-            'success': True,
-            'options': options
-        })
+        return app.response_class(conversion_options_json(input_format.lower()), mimetype='application/json')
     except Exception as e:
         logger.error(f"Conversion options API error: {str(e)}")
         return jsonify({
@@ -511,10 +744,18 @@ def get_conversion_options(input_format):
             'error': str(e)
         }), 500
 
+# Serialized /api/health body and the monotonic time it stops being reused
+health_cache = {'expires': 0.0, 'body': None}
+
 @app.route('/api/health')
 def health_check():
     """Enhanced health check endpoint"""
     try:
+        # Load balancers probe this constantly; answer from the cache while fresh
+        now = time.monotonic()
+        if now < health_cache['expires']:
+            return app.response_class(health_cache['body'], mimetype='application/json')
+        
         # Check if all components are working
         components_status = {
             'file_handler': True,
@@ -525,19 +766,23 @@ def health_check():
         
         # Check if directories exist
         directories_status = {
-            'uploads': os.path.exists(Config.UPLOAD_FOLDER),
-            'converted': os.path.exists(Config.CONVERTED_FOLDER)
+            'uploads': os.path.exists(UPLOAD_DIR),
+            'converted': os.path.exists(CONVERTED_DIR)
         }
         
         # Check converter capabilities (only the ones that exist in our simplified converter)
         converter_capabilities = {
             'pil_available': converter.pil_available,
+            'pil_simd': converter.pil_simd,
+            'libjpeg_turbo': converter.libjpeg_turbo,
             'pymupdf_available': converter.pymupdf_available,
             'reportlab_available': converter.reportlab_available,
-            'docx_available': converter.docx_available
+            'docx_available': converter.docx_available,
+            'vips_available': converter.vips_available,
+            'img2pdf_available': converter.img2pdf_available
         }
         
-        return jsonify({
+        body = app.json.dumps({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'components': components_status,
@@ -545,6 +790,10 @@ def health_check():
             'converter_capabilities': converter_capabilities,
             'supported_formats': validator.get_supported_formats()
         })
+        health_cache['body'] = body
+        health_cache['expires'] = now + Config.HEALTH_CACHE_SECONDS
+        
+        return app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Health check error: {str(e)}")
@@ -562,17 +811,29 @@ def health():
 @app.errorhandler(404)
 def not_found(e):
     """404 error handler"""
-    return render_template('404.html'), 404
+    return render_static_page('404.html'), 404
 
 @app.errorhandler(500)
 def server_error(e):
     """500 error handler"""
-    return render_template('500.html'), 500
+    return render_static_page('500.html'), 500
 
 @app.errorhandler(413)
 def too_large(e):
     """413 error handler for large files"""
-    return render_template('413.html'), 413
+    return render_static_page('413.html'), 413
+
+def warm_static_pages():
+    """Render the static pages once at startup instead of on their first request"""
+    if app.jinja_env.auto_reload:
+        return
+    
+    # With preload_app this runs in the gunicorn master, so every worker inherits the pages
+    with app.test_request_context():
+        for template_name in ('index.html', 'about.html', 'html_to_pdf.html', '404.html', '500.html', '413.html'):
+            prerendered_page(template_name)
+
+warm_static_pages()
 
 if __name__ == '__main__':
     app.run(debug=Config.DEBUG, host=Config.HOST, port=Config.PORT)
\ No newline at end of file
@@ -8,8 +8,13 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 500 * 1024 * 1024))  # 500MB
     
+    # Static files are requested with a ?v=<mtime> cache buster, so browsers can keep them
+    SEND_FILE_MAX_AGE_DEFAULT = int(os.environ.get('SEND_FILE_MAX_AGE_DEFAULT', 365 * 24 * 3600))
+    
     # Server settings
     DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
+    # Otherwise Flask follows DEBUG and re-checks every template file on each render
+    TEMPLATES_AUTO_RELOAD = os.environ.get('TEMPLATES_AUTO_RELOAD', 'False').lower() == 'true'
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5001))
     
@@ -17,8 +22,18 @@ class Config:
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     CONVERTED_FOLDER = os.environ.get('CONVERTED_FOLDER', 'converted')
     
+    # Download offloading: let the front-end proxy send converted files.
+    # X_ACCEL_REDIRECT_PREFIX is an nginx "internal" location aliased to
+    # CONVERTED_FOLDER; USE_X_SENDFILE is Flask's Apache/lighttpd switch
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '')
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'False').lower() == 'true'
+    
+    # Upload settings
+    MAX_FORM_MEMORY_SIZE = int(os.environ.get('MAX_FORM_MEMORY_SIZE', 1024 * 1024))  # non-file fields
+    UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 1024 * 1024))  # 1MB per write
+    
     # Universal supported file extensions
-    ALLOWED_EXTENSIONS = {
+    ALLOWED_EXTENSIONS = frozenset({
         # Images
         'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg',
         
@@ -48,17 +63,52 @@ class Config:
         
         # Other common formats
         'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml'
-    }
+    })
     
     # Conversion settings
     IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 85))
+    # Extra encoder passes (JPEG Huffman tables, PNG zlib level 9) for a few percent smaller files
+    IMAGE_OPTIMIZE = os.environ.get('IMAGE_OPTIMIZE', 'False').lower() == 'true'
     IMAGE_MAX_DIMENSION = int(os.environ.get('IMAGE_MAX_DIMENSION', 2048))
     PDF_RESOLUTION = int(os.environ.get('PDF_RESOLUTION', 300))
+    # Largest side, in pixels, of a PDF page rendered to an image; lowers the DPI
+    # of big pages to save render/encode time (0 always renders at the full DPI)
+    PDF_RENDER_MAX_DIMENSION = int(os.environ.get('PDF_RENDER_MAX_DIMENSION', 0))
+    # Images at least this large convert through libvips (when installed) in bounded memory
+    VIPS_MIN_FILE_SIZE = int(os.environ.get('VIPS_MIN_FILE_SIZE', 20 * 1024 * 1024))  # 20MB
+    
+    # Concurrent conversions per process, by the library doing the heavy lifting
+    PDF_CONVERSION_LIMIT = int(os.environ.get('PDF_CONVERSION_LIMIT', max(1, (os.cpu_count() or 2) // 2)))
+    IMAGE_CONVERSION_LIMIT = int(os.environ.get('IMAGE_CONVERSION_LIMIT', os.cpu_count() or 2))
+    # Run conversions in this many separate processes (0 converts in the request thread).
+    # gunicorn workers already spread requests over processes; this helps with few workers
+    CONVERSION_PROCESSES = int(os.environ.get('CONVERSION_PROCESSES', 0))
+    CONVERSION_TIMEOUT = int(os.environ.get('CONVERSION_TIMEOUT', 120))
+    # Extract text from PDFs of at least PDF_PARALLEL_MIN_PAGES pages in this many
+    # processes (0 keeps extraction in the converting thread)
+    PDF_PAGE_PROCESSES = int(os.environ.get('PDF_PAGE_PROCESSES', 0))
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 50))
+    HTML_TO_PDF_LIMIT = int(os.environ.get('HTML_TO_PDF_LIMIT', 2))  # concurrent browser pages
+    HTML_TO_PDF_TIMEOUT = int(os.environ.get('HTML_TO_PDF_TIMEOUT', 60))
+    # Keep one Node.js converter and browser running instead of launching one per conversion
+    HTML_TO_PDF_PERSISTENT = os.environ.get('HTML_TO_PDF_PERSISTENT', 'True').lower() == 'true'
+    
+    # Identical uploads reuse earlier results. The cache lives under the
+    # converted folder so entries can be hard-linked rather than copied
+    CONVERSION_CACHE_ENABLED = os.environ.get('CONVERSION_CACHE_ENABLED', 'True').lower() == 'true'
+    CONVERSION_CACHE_FOLDER = os.environ.get('CONVERSION_CACHE_FOLDER', os.path.join(CONVERTED_FOLDER, '.cache'))
+    
+    # Background job settings
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', os.cpu_count() or 2))
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 3600))  # 1 hour
     
     # Cleanup settings
     CLEANUP_INTERVAL = int(os.environ.get('CLEANUP_INTERVAL', 3600))  # 1 hour
     FILE_RETENTION_HOURS = int(os.environ.get('FILE_RETENTION_HOURS', 24))  # 24 hours
     
+    # Health check responses are reused for this many seconds
+    HEALTH_CACHE_SECONDS = float(os.environ.get('HEALTH_CACHE_SECONDS', 5))
+    
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = 'app.log' 
\ No newline at end of file
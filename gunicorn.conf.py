@@ -9,7 +9,11 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
-worker_class = "sync"
+# Threaded workers let uploads, downloads and conversions overlap inside a
+# worker instead of serializing one request per process. Pillow and PyMuPDF
+# drop the GIL while encoding/rendering, so one thread per core scales
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', os.cpu_count() or 4))
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
@@ -33,6 +37,8 @@ pidfile = "/tmp/gunicorn.pid"
 user = None
 group = None
 tmp_upload_dir = None
+# Let the kernel copy downloads straight from the page cache to the socket
+sendfile = True
 
 # Security
 limit_request_line = 4094
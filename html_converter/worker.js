@@ -0,0 +1,43 @@
+// Long-running converter used by the Flask app: one JSON request per stdin
+// line, one JSON reply per stdout line. Keeps a single headless browser warm
+// instead of launching one for every conversion.
+const readline = require('readline');
+const UltimateHTMLToPDFConverter = require('./converter.js');
+
+const converter = new UltimateHTMLToPDFConverter();
+const ready = converter.initialize().then(() => {
+    // Let the app start a fresh worker if the browser goes away
+    converter.browser.on('disconnected', () => process.exit(1));
+});
+
+function reply(message) {
+    process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+readline.createInterface({ input: process.stdin })
+    .on('line', async (line) => {
+        let request;
+        try {
+            request = JSON.parse(line);
+        } catch (error) {
+            console.error('Ignoring malformed request:', error.message);
+            return;
+        }
+
+        try {
+            await ready;
+            const result = await converter.convertHTMLToPDF(request.html, request.outputPath, request.options);
+            reply({
+                id: request.id,
+                success: true,
+                fileSize: result.fileSize || 0,
+                pageCount: result.pageCount || 1
+            });
+        } catch (error) {
+            reply({ id: request.id, success: false, error: error.message });
+        }
+    })
+    .on('close', async () => {
+        await converter.close();
+        process.exit(0);
+    });
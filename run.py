@@ -7,9 +7,23 @@ This script sets up and runs the application with proper configuration.
 import os
 import sys
 import subprocess
+import shutil
+import hashlib
 import platform
 from pathlib import Path
 
+# Must match the template_folder the Flask app is created with
+TEMPLATES_DIR = 'Templates'
+# Every page the app renders, in the order missing ones are reported
+REQUIRED_TEMPLATES = ('base.html', 'index.html', 'success.html', 'about.html', 'html_to_pdf.html',
+                      '404.html', '500.html', '413.html')
+
+# Looked up once; picks the install instructions to print
+SYSTEM = platform.system().lower()
+
+# Fingerprint of the last requirements.txt installed successfully
+DEPS_STAMP = Path('.deps-stamp')
+
 def check_python_version():
     """Check if Python version is 3.8 or higher."""
     if sys.version_info < (3, 8):
@@ -18,11 +32,25 @@ def check_python_version():
         sys.exit(1)
     print(f"✅ Python {sys.version.split()[0]} detected")
 
+def requirements_fingerprint():
+    """Hash of requirements.txt and the interpreter it is installed into."""
+    digest = hashlib.sha256(Path('requirements.txt').read_bytes())
+    digest.update(sys.executable.encode())
+    return digest.hexdigest()
+
 def install_requirements():
     """Install Python requirements."""
+    fingerprint = requirements_fingerprint()
+    if DEPS_STAMP.exists() and DEPS_STAMP.read_text().strip() == fingerprint:
+        print("✅ Python dependencies up to date")
+        return
+    
     print("📦 Installing Python dependencies...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install",
+                               "--disable-pip-version-check", "--no-input", "--prefer-binary",
+                               "-r", "requirements.txt"])
+        DEPS_STAMP.write_text(fingerprint)
         print("✅ Python dependencies installed successfully")
     except subprocess.CalledProcessError:
         print("❌ Failed to install Python dependencies")
@@ -33,76 +61,62 @@ def check_system_dependencies():
     """Check and suggest system dependencies."""
     print("\n🔍 Checking system dependencies...")
     
-    # Check for LibreOffice
-    try:
-        result = subprocess.run(['libreoffice', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            print("✅ LibreOffice detected")
-        else:
-            print("⚠️  LibreOffice not found")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        print("⚠️  LibreOffice not found")
-        print_libreoffice_instructions()
+    checks = [
+        ("LibreOffice", 'libreoffice', print_libreoffice_instructions),
+        ("Pandoc", 'pandoc', print_pandoc_instructions)
+    ]
     
-    # Check for Pandoc
-    try:
-        result = subprocess.run(['pandoc', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            print("✅ Pandoc detected")
+    # A PATH lookup is enough to know the tool is installed; no need to start it
+    for name, executable, print_instructions in checks:
+        if shutil.which(executable):
+            print(f"✅ {name} detected")
         else:
-            print("⚠️  Pandoc not found")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        print("⚠️  Pandoc not found")
-        print_pandoc_instructions()
+            print(f"⚠️  {name} not found")
+            print_instructions()
+
+LIBREOFFICE_INSTRUCTIONS = {
+    'linux': "💡 Install LibreOffice: sudo apt-get install libreoffice",
+    'darwin': "💡 Install LibreOffice: brew install --cask libreoffice",
+    'windows': "💡 Download LibreOffice from: https://www.libreoffice.org/download/"
+}
+
+PANDOC_INSTRUCTIONS = {
+    'linux': "💡 Install Pandoc: sudo apt-get install pandoc",
+    'darwin': "💡 Install Pandoc: brew install pandoc",
+    'windows': "💡 Download Pandoc from: https://pandoc.org/installing.html"
+}
 
 def print_libreoffice_instructions():
     """Print LibreOffice installation instructions."""
-    system = platform.system().lower()
-    if system == "linux":
-        print("💡 Install LibreOffice: sudo apt-get install libreoffice")
-    elif system == "darwin":  # macOS
-        print("💡 Install LibreOffice: brew install --cask libreoffice")
-    elif system == "windows":
-        print("💡 Download LibreOffice from: https://www.libreoffice.org/download/")
+    instructions = LIBREOFFICE_INSTRUCTIONS.get(SYSTEM)
+    if instructions:
+        print(instructions)
 
 def print_pandoc_instructions():
     """Print Pandoc installation instructions."""
-    system = platform.system().lower()
-    if system == "linux":
-        print("💡 Install Pandoc: sudo apt-get install pandoc")
-    elif system == "darwin":  # macOS
-        print("💡 Install Pandoc: brew install pandoc")
-    elif system == "windows":
-        print("💡 Download Pandoc from: https://pandoc.org/installing.html")
+    instructions = PANDOC_INSTRUCTIONS.get(SYSTEM)
+    if instructions:
+        print(instructions)
 
 def create_directories():
     """Create necessary directories."""
     print("\n📁 Creating directories...")
-    directories = ['uploads', 'converted', 'Templates']
-    
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
+    for directory in ('uploads', 'converted', TEMPLATES_DIR):
+        os.makedirs(directory, exist_ok=True)
     
     print("✅ Directories created")
 
 def check_template_files():
     """Check if template files exist."""
     print("\n📄 Checking template files...")
-    required_templates = [
-        'Templates/base.html',
-        'Templates/index.html', 
-        'Templates/success.html',
-        'Templates/about.html',
-        'Templates/404.html',
-        'Templates/500.html'
-    ]
+    # One directory listing instead of a stat per template
+    try:
+        with os.scandir(TEMPLATES_DIR) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        present = set()
     
-    missing_templates = []
-    for template in required_templates:
-        if not Path(template).exists():
-            missing_templates.append(template)
+    missing_templates = [f"{TEMPLATES_DIR}/{name}" for name in REQUIRED_TEMPLATES if name not in present]
     
     if missing_templates:
         print(f"⚠️  Missing templates: {', '.join(missing_templates)}")
@@ -138,7 +152,8 @@ def run_application():
     print("-" * 50)
     
     try:
-        # Import and run the app
+        # Imported only now, in the main thread, so the checks above run
+        # without loading Flask and the converters first
         from app import app
         app.run(
             host='0.0.0.0',
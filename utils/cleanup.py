@@ -1,5 +1,6 @@
 import os
 import time
+import heapq
 import threading
 import logging
 from config import Config
@@ -15,69 +16,139 @@ class CleanupManager:
         self.file_retention_time = Config.FILE_RETENTION_HOURS * 3600
         self.upload_folder = Config.UPLOAD_FOLDER
         self.converted_folder = Config.CONVERTED_FOLDER
+        self.cache_folder = Config.CONVERSION_CACHE_FOLDER
         self.cleanup_thread = None
         self.running = False
+        # folder -> (folder mtime_ns, earliest expiry_ns) as of its last sweep
+        self._folder_state = {}
+        # (deadline, path) entries for files scheduled via schedule_cleanup
+        self._heap = []
+        self._cv = threading.Condition()
     
     def start_cleanup_thread(self):
         """Start the cleanup thread"""
-        if self.cleanup_thread is None or not self.cleanup_thread.is_alive():
-            self.running = True
-            self.cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-            self.cleanup_thread.start()
-            logger.info("Cleanup thread started")
+        with self._cv:
+            if self.cleanup_thread is None or not self.cleanup_thread.is_alive():
+                self.running = True
+                self.cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
+                self.cleanup_thread.start()
+                logger.info("Cleanup thread started")
+    
+    def reset_after_fork(self):
+        """Drop the parent's thread, lock and schedule in a forked child"""
+        # Threads do not survive fork() and the lock may have been copied
+        # while held; the child starts its thread on its first schedule_cleanup
+        self._cv = threading.Condition()
+        self._heap = []
+        self.cleanup_thread = None
     
     def stop_cleanup_thread(self):
         """Stop the cleanup thread"""
-        self.running = False
+        with self._cv:
+            self.running = False
+            self._cv.notify()
         if self.cleanup_thread and self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=5)
             logger.info("Cleanup thread stopped")
     
     def _cleanup_loop(self):
         """Main cleanup loop"""
+        next_sweep = time.time()
+        retry_delay = 1.0
         while self.running:
             try:
-                self._cleanup_old_files()
-                time.sleep(self.cleanup_interval)
+                now = time.time()
+                if now >= next_sweep:
+                    self._cleanup_old_files()
+                    next_sweep = now + self.cleanup_interval
+                self._delete_due_files(now)
+                retry_delay = 1.0
+                
+                # Sleep until the next sweep or scheduled deletion, whichever is first
+                with self._cv:
+                    timeout = next_sweep - time.time()
+                    if self._heap:
+                        timeout = min(timeout, self._heap[0][0] - time.time())
+                    if self.running and timeout > 0:
+                        self._cv.wait(timeout)
             except Exception as e:
-                logger.error(f"Cleanup error: {e}")
-                time.sleep(60)  # Wait 1 minute before retrying
+                # Retry soon after a blip, backing off (up to one interval) if it persists
+                logger.error(f"Cleanup error, retrying in {retry_delay:.0f}s: {e}")
+                with self._cv:
+                    if self.running:
+                        self._cv.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.cleanup_interval)
+    
+    def _delete_due_files(self, now: float):
+        """Delete scheduled files whose deadline has passed"""
+        due = []
+        with self._cv:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[1])
+        
+        for file_path in due:
+            self._delete_file_safely(file_path)
     
     def _cleanup_old_files(self):
-        """Clean up old files from upload and converted folders"""
+        """Clean up old files from the upload, converted and cache folders"""
         try:
-            current_time = time.time()
-            deleted_count = 0
-            
-            for folder in [self.upload_folder, self.converted_folder]:
-                if not os.path.exists(folder):
-                    continue
+            deleted_count = self._delete_expired_files()
+            if deleted_count > 0:
+                logger.info(f"Cleaned up {deleted_count} old files")
                 
-                for filename in os.listdir(folder):
-                    file_path = os.path.join(folder, filename)
+        except Exception as e:
+            logger.error(f"Error during cleanup: {e}")
+    
+    def _delete_expired_files(self) -> int:
+        """Delete files older than the retention time and return how many were removed"""
+        now_ns = time.time_ns()
+        retention_ns = int(self.file_retention_time * 1_000_000_000)
+        cutoff_ns = now_ns - retention_ns
+        deleted_count = 0
+        
+        for folder in [self.upload_folder, self.converted_folder, self.cache_folder]:
+            try:
+                # Taken before scanning, so files added meanwhile show up as a change
+                folder_mtime_ns = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            
+            # Nothing added or removed since the last sweep and nothing old enough yet
+            state = self._folder_state.get(folder)
+            if state is not None and state[0] == folder_mtime_ns and now_ns < state[1]:
+                continue
+            
+            # Anything this sweep misses is newer than now, so expires after now + retention
+            earliest_expiry_ns = now_ns + retention_ns
+            
+            # scandir gets the file type from the directory listing, so only
+            # regular files cost a stat() and nothing is checked twice
+            with os.scandir(folder) as entries:
+                for entry in entries:
                     try:
-                        # Check file age
-                        file_age = current_time - os.path.getmtime(file_path)
-                        if file_age > self.file_retention_time:
-                            if self._delete_file_safely(file_path):
-                                deleted_count += 1
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                        if mtime_ns >= cutoff_ns:
+                            earliest_expiry_ns = min(earliest_expiry_ns, mtime_ns + retention_ns)
+                        elif self._delete_file_safely(entry.path):
+                            deleted_count += 1
                     except OSError:
                         # File might have been deleted by another process
                         continue
             
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old files")
-                
-        except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            # Our own deletions change the folder mtime, so the next sweep rescans once
+            self._folder_state[folder] = (folder_mtime_ns, earliest_expiry_ns)
+        
+        return deleted_count
     
     def _delete_file_safely(self, file_path: str) -> bool:
         """Safely delete a file"""
         try:
-            if os.path.exists(file_path) and os.path.isfile(file_path):
-                os.remove(file_path)
-                logger.debug(f"Deleted file: {file_path}")
-                return True
+            os.remove(file_path)
+            logger.debug(f"Deleted file: {file_path}")
+            return True
+        except FileNotFoundError:
             return False
         except Exception as e:
             logger.error(f"Error deleting file {file_path}: {e}")
@@ -86,23 +157,7 @@ class CleanupManager:
     def cleanup_now(self) -> int:
         """Trigger immediate cleanup and return number of deleted files"""
         try:
-            current_time = time.time()
-            deleted_count = 0
-            
-            for folder in [self.upload_folder, self.converted_folder]:
-                if not os.path.exists(folder):
-                    continue
-                
-                for filename in os.listdir(folder):
-                    file_path = os.path.join(folder, filename)
-                    try:
-                        file_age = current_time - os.path.getmtime(file_path)
-                        if file_age > self.file_retention_time:
-                            if self._delete_file_safely(file_path):
-                                deleted_count += 1
-                    except OSError:
-                        continue
-            
+            deleted_count = self._delete_expired_files()
             if deleted_count > 0:
                 logger.info(f"Manual cleanup: deleted {deleted_count} files")
             
@@ -113,6 +168,11 @@ class CleanupManager:
             return 0
     
     def schedule_cleanup(self, file_path: str):
-        """Schedule a file for cleanup (this is handled by the cleanup loop)"""
-        # The cleanup loop will automatically handle files based on their modification time
-        logger.debug(f"File scheduled for cleanup: {file_path}") 
\ No newline at end of file
+        """Schedule a file for deletion once the retention time has passed"""
+        deadline = time.time() + self.file_retention_time
+        with self._cv:
+            heapq.heappush(self._heap, (deadline, file_path))
+            self._cv.notify()
+        # Workers forked from a preloaded app have no cleanup thread of their own yet
+        self.start_cleanup_thread()
+        logger.debug(f"File scheduled for cleanup: {file_path}")
@@ -0,0 +1,68 @@
+import os
+import hashlib
+import logging
+from config import Config
+from utils.file_handler import file_extension
+
+logger = logging.getLogger(__name__)
+
+class ConversionCache:
+    """Reuses converted files for identical uploads, keyed by content hash"""
+
+    def __init__(self):
+        self.enabled = Config.CONVERSION_CACHE_ENABLED
+        self.cache_folder = Config.CONVERSION_CACHE_FOLDER
+        self.chunk_size = Config.UPLOAD_CHUNK_SIZE
+
+        if self.enabled:
+            os.makedirs(self.cache_folder, exist_ok=True)
+
+    def file_digest(self, file_path: str) -> str:
+        """SHA-256 of a file's contents"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(self.chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(self, input_path: str, target_format: str, image_quality: int, pdf_resolution: int,
+                 optimize: bool, input_digest: str = None) -> str:
+        """Cache key for converting input_path with the given settings"""
+        # Uploads are normally hashed while they stream in; read the file back otherwise
+        input_digest = input_digest or self.file_digest(input_path)
+
+        # The input extension picks the converter, so identical bytes under
+        # another extension are a different conversion
+        return (f"{input_digest}_{file_extension(input_path)}"
+                f"_{target_format}_q{image_quality}_r{pdf_resolution}_o{int(optimize)}")
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Link a cached result to output_path; False on a cache miss"""
+        cache_path = os.path.join(self.cache_folder, key)
+        try:
+            os.link(cache_path, output_path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not reuse cached conversion {key}: {e}")
+            return False
+
+        # Touch the entry so the age-based sweep evicts least recently used results
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+        logger.info(f"Conversion cache hit: {key}")
+        return True
+
+    def store(self, key: str, output_path: str):
+        """Keep a finished conversion for later identical requests"""
+        cache_path = os.path.join(self.cache_folder, key)
+        try:
+            os.link(output_path, cache_path)
+        except FileExistsError:
+            # Another request converted the same input at the same time
+            pass
+        except OSError as e:
+            logger.warning(f"Could not cache conversion {key}: {e}")
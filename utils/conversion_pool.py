@@ -0,0 +1,101 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# The converter owned by each pool process, built once when the process starts
+_worker_converter = None
+
+def _init_worker():
+    """Set up logging and a converter in a freshly started pool process"""
+    global _worker_converter
+    from utils.converter import FileConverter
+
+    logging.basicConfig(level=Config.LOG_LEVEL.upper(), format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    _worker_converter = FileConverter()
+
+def _convert_in_worker(input_path: str, output_path: str, target_format: str, settings: dict,
+                       deadline: float) -> dict:
+    """Run one conversion inside a pool process"""
+    result = _worker_converter.convert_file(input_path, output_path, target_format, **settings)
+    if time.time() >= deadline:
+        # The caller has already given up on this conversion and removed its
+        # output; remove what we wrote since then rather than leave an orphan
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            pass
+        return {'success': False, 'error': 'Conversion timed out'}
+    return result
+
+class ConversionPool:
+    """Runs conversions in separate processes so Python-heavy converters use every core"""
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.processes = Config.CONVERSION_PROCESSES
+        self.timeout = Config.CONVERSION_TIMEOUT
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Start the pool on first use so preloaded gunicorn masters never own one"""
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded worker can copy held locks; start clean processes instead
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                logger.info(f"Started conversion pool with {self.processes} processes")
+            return self._executor
+
+    def _discard_executor(self, executor, terminate: bool = False):
+        """Drop a broken pool so the next conversion starts a new one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # A running task cannot be cancelled, so a stuck one is stopped by
+        # killing the pool's processes; wait for them so nothing writes after
+        processes = list((executor._processes or {}).values()) if terminate else []
+        for process in processes:
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.join(5)
+
+    def convert(self, input_path: str, output_path: str, target_format: str, **settings) -> dict:
+        """Convert a file, in a pool process when the pool is enabled"""
+        if self.processes <= 0:
+            return self.converter.convert_file(input_path, output_path, target_format, **settings)
+
+        executor = self._get_executor()
+        try:
+            deadline = time.time() + self.timeout
+            future = executor.submit(_convert_in_worker, input_path, output_path, target_format, settings, deadline)
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # Recycle the pool so the stuck conversion stops taking a process.
+            # Conversions running on its other processes fail along with it
+            logger.error(f"Conversion timed out after {self.timeout}s, restarting the pool: {input_path}")
+            self._discard_executor(executor, terminate=True)
+            return {'success': False, 'error': 'Conversion timed out'}
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for running out of memory)
+            logger.error(f"Conversion process crashed: {input_path}")
+            self._discard_executor(executor)
+            return {'success': False, 'error': 'Conversion failed'}
+
+    def shutdown(self):
+        """Stop the pool processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
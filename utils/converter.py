@@ -1,33 +1,231 @@
 import os
 import io
-import tempfile
+import base64
 import subprocess
 import logging
+import threading
+import multiprocessing
 import json
 import csv
+import codecs
+import re
+import html
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
+from importlib.util import find_spec
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
 from config import Config
+from utils.file_handler import file_extension, link_or_copy
 
 logger = logging.getLogger(__name__)
 
+# Imported once here rather than inside each conversion; pymupdf_available
+# guards every use
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# Faster JSON parsing and serialization for the data converters, when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pillow format names for extensions that differ from the upper-cased extension
+PIL_FORMAT_NAMES = {'jpg': 'JPEG', 'tif': 'TIFF'}
+
+# Universal format mappings used to dispatch conversions
+IMAGE_FORMATS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg'})
+DOCUMENT_FORMATS = frozenset({'pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm'})
+SPREADSHEET_FORMATS = frozenset({'xlsx', 'xls', 'csv'})
+PRESENTATION_FORMATS = frozenset({'pptx', 'ppt'})
+DATA_FORMATS = frozenset({'json', 'xml'})
+# Formats libvips reads and writes without extra loaders (ImageMagick, cgif)
+VIPS_FORMATS = frozenset({'jpg', 'jpeg', 'png', 'webp', 'tiff', 'tif'})
+CODE_FORMATS = frozenset({'py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml'})
+
+# Formats listed by get_supported_formats
+SUPPORTED_FORMATS = {
+    'image_formats': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg'),
+    'document_formats': ('pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm'),
+    'spreadsheet_formats': ('xlsx', 'xls', 'csv'),
+    'presentation_formats': ('pptx', 'ppt'),
+    'data_formats': ('json', 'xml'),
+    'code_formats': ('py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml')
+}
+
+# Target formats offered for each input format, built once and shared
+CONVERSION_OPTIONS = {
+    # Image formats
+    'jpg': ('png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'),
+    'jpeg': ('png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'),
+    'png': ('jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'),
+    'gif': ('jpg', 'jpeg', 'png', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'),
+    'bmp': ('jpg', 'jpeg', 'png', 'gif', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'),
+    'tiff': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'ico', 'svg', 'pdf'),
+    'tif': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'ico', 'svg', 'pdf'),
+    'webp': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'ico', 'svg', 'pdf'),
+    'ico': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'svg', 'pdf'),
+    'svg': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'pdf'),
+
+    # Document formats
+    'pdf': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'txt', 'html', 'docx', 'doc'),
+    'txt': ('pdf', 'html', 'md'),
+    'docx': ('pdf', 'txt', 'html'),
+    'doc': ('pdf', 'txt', 'html'),
+    'rtf': ('pdf', 'txt', 'html'),
+    'md': ('pdf', 'html', 'txt'),
+    'html': ('pdf', 'txt', 'md'),
+    'htm': ('pdf', 'txt', 'md'),
+
+    # Spreadsheet formats
+    'xlsx': ('csv', 'json', 'xml', 'pdf'),
+    'xls': ('csv', 'json', 'xml', 'pdf'),
+    'csv': ('json', 'xml', 'pdf'),
+
+    # Data formats
+    'json': ('xml', 'csv'),
+    'xml': ('json', 'csv'),
+
+    # Code formats
+    'py': ('html', 'txt'),
+    'js': ('html', 'txt'),
+    'css': ('html', 'txt'),
+    'php': ('html', 'txt'),
+    'java': ('html', 'txt'),
+    'cpp': ('html', 'txt'),
+    'c': ('html', 'txt'),
+    'cs': ('html', 'txt'),
+    'rb': ('html', 'txt'),
+    'go': ('html', 'txt'),
+    'rs': ('html', 'txt'),
+    'log': ('html', 'txt'),
+    'ini': ('html', 'txt'),
+    'cfg': ('html', 'txt'),
+    'conf': ('html', 'txt'),
+    'yaml': ('html', 'txt'),
+    'yml': ('html', 'txt'),
+    'toml': ('html', 'txt')
+}
+
+# Text conversions read and write this much at a time instead of whole files
+TEXT_CHUNK_SIZE = 1024 * 1024
+
+# Bytes read from the start of a text upload to guess its encoding
+TEXT_SNIFF_SIZE = 4096
+
+# Formats SVG viewers can display directly, embedded by _convert_to_svg as they are
+SVG_EMBED_TYPES = {'PNG': 'image/png', 'JPEG': 'image/jpeg', 'GIF': 'image/gif', 'WEBP': 'image/webp'}
+
+# Raw bytes base64-encoded per write when embedding images; a multiple of 3
+# so no padding appears mid-stream
+BASE64_CHUNK_SIZE = 48 * 1024
+
+# Page wrapped around plain text converted to HTML; the escaped text goes
+# between the two halves
+TEXT_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Converted Document</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+        pre { background-color: #f5f5f5; padding: 15px; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <pre>"""
+TEXT_HTML_FOOTER = """</pre>
+</body>
+</html>"""
+
+# RTF control characters, escaped in one pass with str.translate
+RTF_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '{': '\\{', '}': '\\}'})
+
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Control characters XML 1.0 cannot contain, removed from text written to DOCX
+XML_INVALID_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+DOCX_PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+# Markdown syntax removed for Markdown to text, applied in order
+MARKDOWN_STRIP_PATTERNS = (
+    (re.compile(r'#+\s*'), ''),  # Remove headers
+    (re.compile(r'\*\*(.*?)\*\*'), r'\1'),  # Remove bold
+    (re.compile(r'\*(.*?)\*'), r'\1'),  # Remove italic
+    (re.compile(r'`(.*?)`'), r'\1'),  # Remove inline code
+    # Remove links. The text and target stop at the next bracket: with a lazy
+    # .*? a line of unclosed links took cubic time to scan
+    (re.compile(r'\[([^\[\]\n]*)\]\([^()\[\]\n]*\)'), r'\1')
+)
+
+def _extract_pages_text(pdf_path: str, start: int, stop: int) -> list:
+    """Text of pages start to stop-1 of a PDF, run in a page pool process"""
+    with fitz.open(pdf_path) as doc:
+        return [doc[page_num].get_text() for page_num in range(start, stop)]
+
+def pil_format(extension: str) -> str:
+    """Pillow save format for a file extension"""
+    return PIL_FORMAT_NAMES.get(extension, extension.upper())
+
 class FileConverter:
     """Handles file conversion between different formats - Universal version"""
     
     def __init__(self):
         self.image_quality = Config.IMAGE_QUALITY
+        self.optimize_images = Config.IMAGE_OPTIMIZE
         self.image_max_dimension = Config.IMAGE_MAX_DIMENSION
         self.pdf_resolution = Config.PDF_RESOLUTION
+        self.pdf_render_max_dimension = Config.PDF_RENDER_MAX_DIMENSION
+        self.vips_min_file_size = Config.VIPS_MIN_FILE_SIZE
+        self.page_processes = Config.PDF_PAGE_PROCESSES
+        self.parallel_min_pages = Config.PDF_PARALLEL_MIN_PAGES
+        self._page_pool = None
+        self._page_pool_lock = threading.Lock()
         
-        # Check available libraries
+        # Check available libraries. Pure-Python optional packages are only
+        # located here; conversions import them the first time they need them
         self.pil_available = self._check_pil()
+        self.pil_simd = self._check_pil_simd()
+        self.libjpeg_turbo = self._check_libjpeg_turbo()
         self.pymupdf_available = self._check_pymupdf()
         self.reportlab_available = self._check_reportlab()
         self.docx_available = self._check_docx()
+        self.oxipng_available = self._check_oxipng()
+        self.vips_available = self._check_vips()
+        self.img2pdf_available = self._check_img2pdf()
+        self.cairosvg_available = self._check_cairosvg()
+        self.ijson_available = self._check_ijson()
+        self._malloc_trim = self._load_malloc_trim()
+        
+        # Input/target pairs that have their own converter, looked up before the
+        # general per-category rules in convert_file
+        self._pair_converters = {
+            ('pdf', 'docx'): self._convert_pdf_to_docx,
+            ('pdf', 'doc'): self._convert_pdf_to_doc,
+            ('pdf', 'txt'): self._convert_pdf_to_text,
+            ('txt', 'pdf'): self._convert_text_to_pdf,
+            ('docx', 'pdf'): self._convert_docx_to_pdf,
+            ('docx', 'txt'): self._convert_docx_to_text,
+            ('csv', 'json'): self._convert_csv_to_json,
+            ('csv', 'xml'): self._convert_csv_to_xml,
+            ('json', 'csv'): self._convert_json_to_csv
+        }
+        
+        # Cap how many memory-hungry conversions run at once in this process
+        self._conversion_limits = {
+            'pdf': threading.BoundedSemaphore(Config.PDF_CONVERSION_LIMIT),
+            'image': threading.BoundedSemaphore(Config.IMAGE_CONVERSION_LIMIT)
+        }
         
-        logger.info(f"Universal Converter initialized - PIL: {self.pil_available}, PyMuPDF: {self.pymupdf_available}, "
-                   f"ReportLab: {self.reportlab_available}, DOCX: {self.docx_available}")
+        logger.info(f"Universal Converter initialized - PIL: {self.pil_available} (SIMD: {self.pil_simd}, libjpeg-turbo: {self.libjpeg_turbo}), PyMuPDF: {self.pymupdf_available}, "
+                   f"ReportLab: {self.reportlab_available}, DOCX: {self.docx_available}, oxipng: {self.oxipng_available}, "
+                   f"libvips: {self.vips_available}, img2pdf: {self.img2pdf_available}")
     
     def _check_pil(self):
         """Check if PIL/Pillow is available"""
@@ -37,109 +235,186 @@ class FileConverter:
         except ImportError:
             return False
     
-    def _check_pymupdf(self):
-        """Check if PyMuPDF is available"""
+    def _check_pil_simd(self):
+        """Check if the Pillow build is Pillow-SIMD (AVX2 resize/convert paths)"""
         try:
-            import fitz
-            return True
+            import PIL
+            from PIL import Image
+            # Pillow-SIMD releases are versioned as Pillow's plus a ".postN" suffix
+            return 'SIMD' in (Image.core.__doc__ or '') or '.post' in PIL.__version__
         except ImportError:
             return False
     
-    def _check_reportlab(self):
-        """Check if ReportLab is available"""
+    def _check_libjpeg_turbo(self):
+        """Check if Pillow's JPEG codec is libjpeg-turbo (SIMD IDCT and colour conversion)"""
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate
-            return True
-        except ImportError:
+            from PIL import features
+            return bool(features.check_feature('libjpeg_turbo'))
+        except (ImportError, ValueError):
             return False
     
+    def _check_pymupdf(self):
+        """Check if PyMuPDF is available"""
+        return fitz is not None
+    
+    def _check_reportlab(self):
+        """Check if ReportLab is installed (imported on first use)"""
+        return find_spec('reportlab') is not None
+    
     def _check_docx(self):
-        """Check if python-docx is available"""
+        """Check if python-docx is installed (imported on first use)"""
+        return find_spec('docx') is not None
+    
+    def _check_cairosvg(self):
+        """Check if cairosvg is installed (imported on first use)"""
+        return find_spec('cairosvg') is not None
+    
+    def _check_ijson(self):
+        """Check if ijson is installed (imported on first use)"""
+        return find_spec('ijson') is not None
+    
+    def _check_oxipng(self):
+        """Check if pyoxipng is installed (imported on first use)"""
+        return find_spec('oxipng') is not None
+    
+    def _check_vips(self):
+        """Check if pyvips and the libvips library are available"""
         try:
-            from docx import Document
+            import pyvips
             return True
-        except ImportError:
+        except (ImportError, OSError):
             return False
     
-    def convert_file(self, input_path: str, output_path: str, target_format: str) -> dict:
+    def _check_img2pdf(self):
+        """Check if img2pdf is installed (imported on first use)"""
+        return find_spec('img2pdf') is not None
+    
+    def _load_malloc_trim(self):
+        """Get glibc's malloc_trim, or None on platforms without it"""
+        try:
+            import ctypes
+            libc = ctypes.CDLL('libc.so.6')
+            libc.malloc_trim.argtypes = [ctypes.c_size_t]
+            return libc.malloc_trim
+        except (OSError, AttributeError):
+            return None
+    
+    def _release_memory(self):
+        """Return freed heap pages to the OS after a large conversion"""
+        # MuPDF keeps decoded images and fonts from finished documents in a
+        # process-wide store (up to 256MB); nothing reuses them across uploads
+        if self.pymupdf_available:
+            fitz.TOOLS.store_shrink(100)
+        
+        # Pillow and PyMuPDF buffers are malloc'd; glibc keeps the freed
+        # arenas mapped, so long-running workers grow without this
+        if self._malloc_trim is not None:
+            self._malloc_trim(0)
+    
+    def _get_page_pool(self):
+        """Start the PDF page pool on first use"""
+        with self._page_pool_lock:
+            if self._page_pool is None:
+                # Spawned, not forked, for the same reason as the conversion pool:
+                # forking a threaded worker can copy held locks
+                self._page_pool = ProcessPoolExecutor(
+                    max_workers=self.page_processes,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"Started PDF page pool with {self.page_processes} processes")
+            return self._page_pool
+    
+    def _iter_page_texts(self, doc, input_path: str):
+        """Yield the text of each page of an open PDF, in order"""
+        page_count = len(doc)
+        if self.page_processes > 1 and page_count >= self.parallel_min_pages:
+            # One contiguous run of pages per process, so each opens the PDF once
+            step = -(-page_count // self.page_processes)
+            pool = self._get_page_pool()
+            try:
+                futures = [pool.submit(_extract_pages_text, input_path, start, min(start + step, page_count))
+                           for start in range(0, page_count, step)]
+                texts = [text for future in futures for text in future.result()]
+            except BrokenProcessPool:
+                logger.error("PDF page pool crashed, extracting text in this process")
+                with self._page_pool_lock:
+                    if self._page_pool is pool:
+                        self._page_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                yield from texts
+                return
+        
+        for page in doc:
+            yield page.get_text()
+    
+    def convert_file(self, input_path: str, output_path: str, target_format: str,
+                     image_quality: int = None, pdf_resolution: int = None, optimize: bool = None) -> dict:
         """Main conversion method with universal format support"""
+        # Per-call settings fall back to the configured defaults
+        image_quality = image_quality or self.image_quality
+        pdf_resolution = pdf_resolution or self.pdf_resolution
+        optimize = self.optimize_images if optimize is None else optimize
+        large_conversion = False
+        conversion_limit = None
         try:
-            if not os.path.exists(input_path):
+            # One stat both checks the input exists and gives its size to converters
+            try:
+                input_size = os.stat(input_path).st_size
+            except FileNotFoundError:
                 return {'success': False, 'error': 'Input file not found'}
             
-            input_ext = Path(input_path).suffix[1:].lower()
+            input_ext = file_extension(input_path)
             target_format = target_format.lower()
             
             logger.info(f"Converting {input_ext} to {target_format}")
             
-            # Universal format mappings
-            image_formats = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg']
-            document_formats = ['pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm']
-            spreadsheet_formats = ['xlsx', 'xls', 'csv']
-            presentation_formats = ['pptx', 'ppt']
-            data_formats = ['json', 'xml']
-            code_formats = ['py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml']
-            
             success = False  # Initialize success variable
+            large_conversion = input_ext in IMAGE_FORMATS or input_ext == 'pdf' or target_format == 'pdf'
+            
+            # PyMuPDF/ReportLab work is the heaviest, then Pillow; text formats run unbounded
+            if input_ext == 'pdf' or target_format == 'pdf':
+                conversion_limit = self._conversion_limits['pdf']
+            elif input_ext in IMAGE_FORMATS or target_format in IMAGE_FORMATS:
+                conversion_limit = self._conversion_limits['image']
+            if conversion_limit is not None:
+                conversion_limit.acquire()
             
             # Image conversions
-            if input_ext in image_formats and target_format in image_formats:
-                success = self._convert_image(input_path, output_path, target_format)
-            elif input_ext in image_formats and target_format == 'pdf':
-                success = self._convert_image_to_pdf(input_path, output_path)
-            elif input_ext == 'pdf' and target_format in image_formats:
-                success = self._convert_pdf_to_image(input_path, output_path, target_format)
-            
-            # Special conversions (must come before general document conversions)
-            elif input_ext == 'pdf' and target_format == 'docx':
-                logger.info(f"Attempting PDF to DOCX conversion: {input_path} -> {output_path}")
-                success = self._convert_pdf_to_docx(input_path, output_path)
-                logger.info(f"PDF to DOCX conversion result: {success}")
-            elif input_ext == 'pdf' and target_format == 'doc':
-                logger.info(f"Attempting PDF to DOC conversion: {input_path} -> {output_path}")
-                success = self._convert_pdf_to_doc(input_path, output_path)
-                logger.info(f"PDF to DOC conversion result: {success}")
-            elif input_ext == 'pdf' and target_format == 'txt':
-                success = self._convert_pdf_to_text(input_path, output_path)
-            elif input_ext == 'txt' and target_format == 'pdf':
-                success = self._convert_text_to_pdf(input_path, output_path)
-            elif input_ext == 'docx' and target_format == 'pdf':
-                success = self._convert_docx_to_pdf(input_path, output_path)
-            elif input_ext == 'docx' and target_format == 'txt':
-                success = self._convert_docx_to_text(input_path, output_path)
+            if input_ext in IMAGE_FORMATS and target_format in IMAGE_FORMATS:
+                success = self._convert_image(input_path, output_path, target_format, image_quality, optimize, input_size)
+            elif input_ext in IMAGE_FORMATS and target_format == 'pdf':
+                success = self._convert_image_to_pdf(input_path, output_path, pdf_resolution)
+            elif input_ext == 'pdf' and target_format in IMAGE_FORMATS:
+                success = self._convert_pdf_to_image(input_path, output_path, target_format, pdf_resolution, image_quality)
+            
+            # Conversions with a dedicated converter (must come before general document conversions)
+            elif (pair_converter := self._pair_converters.get((input_ext, target_format))) is not None:
+                success = pair_converter(input_path, output_path)
             
             # Document conversions (general)
-            elif input_ext in document_formats and target_format in document_formats:
+            elif input_ext in DOCUMENT_FORMATS and target_format in DOCUMENT_FORMATS:
                 success = self._convert_document(input_path, output_path, target_format)
             
             # Spreadsheet conversions
-            elif input_ext in spreadsheet_formats and target_format in spreadsheet_formats:
+            elif input_ext in SPREADSHEET_FORMATS and target_format in SPREADSHEET_FORMATS:
                 success = self._convert_spreadsheet(input_path, output_path, target_format)
-            elif input_ext in spreadsheet_formats and target_format == 'pdf':
+            elif input_ext in SPREADSHEET_FORMATS and target_format == 'pdf':
                 success = self._convert_spreadsheet_to_pdf(input_path, output_path)
             
             # Data format conversions
-            elif input_ext in data_formats and target_format in data_formats:
+            elif input_ext in DATA_FORMATS and target_format in DATA_FORMATS:
                 success = self._convert_data_format(input_path, output_path, target_format)
             
             # Code format conversions
-            elif input_ext in code_formats and target_format in code_formats:
+            elif input_ext in CODE_FORMATS and target_format in CODE_FORMATS:
                 success = self._convert_code_format(input_path, output_path, target_format)
             
             # Cross-format conversions
-            elif input_ext in document_formats and target_format == 'pdf':
+            elif input_ext in DOCUMENT_FORMATS and target_format == 'pdf':
                 success = self._convert_to_pdf(input_path, output_path)
-            elif input_ext == 'pdf' and target_format in document_formats:
+            elif input_ext == 'pdf' and target_format in DOCUMENT_FORMATS:
                 success = self._convert_from_pdf(input_path, output_path, target_format)
-            elif input_ext == 'csv' and target_format == 'json':
-                success = self._convert_csv_to_json(input_path, output_path)
-            elif input_ext == 'json' and target_format == 'csv':
-                success = self._convert_json_to_csv(input_path, output_path)
-            elif input_ext == 'json' and target_format == 'xml':
-                success = self._convert_json_to_xml(input_path, output_path)
-            elif input_ext == 'xml' and target_format == 'json':
-                success = self._convert_xml_to_json(input_path, output_path)
             
             else:
                 return {'success': False, 'error': f'Conversion from {input_ext} to {target_format} not supported'}
@@ -152,11 +427,17 @@ class FileConverter:
         except Exception as e:
             logger.error(f"Conversion error: {str(e)}")
             return {'success': False, 'error': f'Conversion error: {str(e)}'}
+        finally:
+            if conversion_limit is not None:
+                conversion_limit.release()
+            if large_conversion:
+                self._release_memory()
     
-    def _convert_image(self, input_path: str, output_path: str, target_format: str) -> bool:
+    def _convert_image(self, input_path: str, output_path: str, target_format: str, image_quality: int,
+                       optimize: bool, input_size: int) -> bool:
         """Convert between image formats"""
         try:
-            input_ext = Path(input_path).suffix[1:].lower()
+            input_ext = file_extension(input_path)
             
             # Handle SVG conversions
             if target_format == 'svg':
@@ -168,10 +449,38 @@ class FileConverter:
             if not self.pil_available:
                 return False
             
+            # Same format, default quality, no optimizing and no resize needed: the
+            # input already is the output, so skip a lossy decode/encode (PNG is
+            # still recompressed losslessly). Requested quality or optimize
+            # settings always re-encode
+            reencode_requested = image_quality != self.image_quality or optimize
+            if (pil_format(input_ext) == pil_format(target_format) and not reencode_requested
+                    and not (target_format == 'png' and self.oxipng_available)):
+                with Image.open(input_path) as img:
+                    needs_resize = max(img.size) > self.image_max_dimension
+                if not needs_resize:
+                    link_or_copy(input_path, output_path)
+                    return True
+            
+            # PNG to PNG is pure recompression; oxipng does it natively without
+            # decoding into Pillow, using several cores for the filter trials
+            if input_ext == 'png' and target_format == 'png' and self.oxipng_available:
+                with Image.open(input_path) as img:
+                    needs_resize = max(img.size) > self.image_max_dimension
+                if not needs_resize:
+                    import oxipng
+                    oxipng.optimize(input_path, output_path, level=2)
+                    return True
+            
+            # Pillow decodes the whole bitmap into memory; libvips streams it
+            if (self.vips_available and input_ext in VIPS_FORMATS and target_format in VIPS_FORMATS
+                    and input_size >= self.vips_min_file_size):
+                return self._convert_image_vips(input_path, output_path, target_format, image_quality, optimize)
+            
             with Image.open(input_path) as img:
                 # Convert to RGB if necessary
                 if target_format in ['jpg', 'jpeg'] and img.mode in ['RGBA', 'LA', 'P']:
-                    img = img.convert('RGB')
+                    img = self._flatten_alpha(img)
                 elif target_format in ['png', 'webp'] and img.mode == 'P':
                     img = img.convert('RGBA')
                 
@@ -179,31 +488,78 @@ class FileConverter:
                 if max(img.size) > self.image_max_dimension:
                     img.thumbnail((self.image_max_dimension, self.image_max_dimension), Image.Resampling.LANCZOS)
                 
-                # Save with appropriate options
+                # Save with appropriate options. Optimizing (extra encoder passes,
+                # progressive JPEG, slowest WebP method) costs several times the
+                # encode time for a few percent, so it is only done when asked for
                 save_kwargs = {}
                 if target_format in ['jpg', 'jpeg']:
-                    save_kwargs['quality'] = self.image_quality
-                    save_kwargs['optimize'] = True
+                    save_kwargs['quality'] = image_quality
+                    save_kwargs['optimize'] = optimize
+                    save_kwargs['progressive'] = optimize
                 elif target_format == 'webp':
-                    save_kwargs['quality'] = self.image_quality
-                    save_kwargs['method'] = 6
+                    save_kwargs['quality'] = image_quality
+                    save_kwargs['method'] = 6 if optimize else 4
                 elif target_format == 'png':
-                    save_kwargs['optimize'] = True
+                    save_kwargs['optimize'] = optimize
                 
-                img.save(output_path, format=target_format.upper(), **save_kwargs)
+                img.save(output_path, format=pil_format(target_format), **save_kwargs)
                 return True
                 
         except Exception as e:
             logger.error(f"Image conversion error: {str(e)}")
             return False
     
-    def _convert_image_to_pdf(self, input_path: str, output_path: str) -> bool:
+    def _convert_image_vips(self, input_path: str, output_path: str, target_format: str, image_quality: int,
+                            optimize: bool) -> bool:
+        """Convert between image formats with libvips, a strip at a time"""
+        import pyvips
+        
+        # thumbnail() shrinks while loading and never enlarges, matching the Pillow path
+        image = pyvips.Image.thumbnail(input_path, self.image_max_dimension, height=self.image_max_dimension,
+                                       size='down', no_rotate=True)
+        
+        save_kwargs = {}
+        if target_format in ['jpg', 'jpeg']:
+            if image.hasalpha():
+                image = image.flatten(background=[255, 255, 255])
+            save_kwargs['Q'] = image_quality
+            save_kwargs['optimize_coding'] = optimize
+            save_kwargs['interlace'] = optimize
+        elif target_format == 'webp':
+            save_kwargs['Q'] = image_quality
+            save_kwargs['effort'] = 6 if optimize else 4
+        
+        image.write_to_file(output_path, **save_kwargs)
+        logger.info(f"Converted {input_path} with libvips")
+        return True
+    
+    def _flatten_alpha(self, img):
+        """Composite an image with transparency onto white for formats without alpha"""
+        if img.mode == 'P' and 'transparency' not in img.info:
+            return img.convert('RGB')
+        
+        # Many PNGs carry an alpha channel that is fully opaque; blending those
+        # would touch every pixel for no visible change
+        if img.mode in ['RGBA', 'LA'] and img.getchannel('A').getextrema()[0] == 255:
+            return img.convert('RGB')
+        
+        # paste() blends the whole image in C, instead of dropping alpha and
+        # exposing whatever is under it. Using the RGBA image as its own mask
+        # reads the alpha band in place, and RGBA input is not copied first
+        rgba = img if img.mode == 'RGBA' else img.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba)
+        return background
+    
+    def _convert_image_to_pdf(self, input_path: str, output_path: str, pdf_resolution: int) -> bool:
         """Convert image to PDF"""
         try:
+            if self.img2pdf_available and self._convert_image_to_pdf_img2pdf(input_path, output_path):
+                return True
             if self.reportlab_available:
                 return self._convert_image_to_pdf_reportlab(input_path, output_path)
             elif self.pil_available:
-                return self._convert_image_to_pdf_pil(input_path, output_path)
+                return self._convert_image_to_pdf_pil(input_path, output_path, pdf_resolution)
             
             return False
             
@@ -211,6 +567,23 @@ class FileConverter:
             logger.error(f"Image to PDF conversion error: {str(e)}")
             return False
     
+    def _convert_image_to_pdf_img2pdf(self, input_path: str, output_path: str) -> bool:
+        """Convert image to PDF by embedding the compressed image data as-is"""
+        try:
+            import img2pdf
+            
+            # JPEG/JPEG 2000 streams are copied without decoding; the image is
+            # fitted onto an A4 page, keeping its aspect ratio
+            layout = img2pdf.get_layout_fun((img2pdf.mm_to_pt(210), img2pdf.mm_to_pt(297)))
+            with open(output_path, 'wb') as f:
+                img2pdf.convert(input_path, layout_fun=layout, outputstream=f)
+            return True
+            
+        except Exception as e:
+            # Images with transparency need compositing, which img2pdf refuses to do
+            logger.info(f"img2pdf could not convert {input_path}, falling back: {str(e)}")
+            return False
+    
     def _convert_image_to_pdf_reportlab(self, input_path: str, output_path: str) -> bool:
         """Convert image to PDF using ReportLab"""
         try:
@@ -232,38 +605,47 @@ class FileConverter:
             logger.error(f"ReportLab image to PDF error: {str(e)}")
             return False
     
-    def _convert_image_to_pdf_pil(self, input_path: str, output_path: str) -> bool:
+    def _convert_image_to_pdf_pil(self, input_path: str, output_path: str, pdf_resolution: int) -> bool:
         """Convert image to PDF using PIL"""
         try:
             with Image.open(input_path) as img:
                 if img.mode in ['RGBA', 'LA', 'P']:
                     img = img.convert('RGB')
-                img.save(output_path, 'PDF', resolution=self.pdf_resolution)
+                img.save(output_path, 'PDF', resolution=pdf_resolution)
                 return True
                 
         except Exception as e:
             logger.error(f"PIL image to PDF error: {str(e)}")
             return False
     
-    def _convert_pdf_to_image(self, input_path: str, output_path: str, target_format: str) -> bool:
+    def _convert_pdf_to_image(self, input_path: str, output_path: str, target_format: str,
+                              pdf_resolution: int, image_quality: int) -> bool:
         """Convert PDF to image"""
         try:
             if self.pymupdf_available:
-                import fitz
-                doc = fitz.open(input_path)
-                page = doc[0]  # First page
-                
-                # Calculate zoom for high resolution
-                zoom = self.pdf_resolution / 72
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convert to PIL Image for format conversion
-                img_data = pix.tobytes("png")
-                with Image.open(io.BytesIO(img_data)) as img:
-                    img.save(output_path, format=target_format.upper())
+                with fitz.open(input_path) as doc:
+                    page = doc[0]  # First page
+                    
+                    # PDF points are 1/72 inch, so this renders at the requested DPI,
+                    # unless the page would come out larger than the configured cap
+                    zoom = pdf_resolution / 72
+                    if self.pdf_render_max_dimension > 0:
+                        zoom = min(zoom, self.pdf_render_max_dimension / max(page.rect.width, page.rect.height))
+                    mat = fitz.Matrix(zoom, zoom)
+                    # No alpha channel, so every encoder below gets plain RGB samples
+                    pix = page.get_pixmap(matrix=mat, alpha=False)
+                    
+                    # PyMuPDF encodes PNG and JPEG itself; for other formats Pillow
+                    # reads the pixmap's own sample memory, without copying it (pix
+                    # stays alive until the save returns)
+                    if target_format == 'png':
+                        pix.save(output_path, output='png')
+                    elif target_format in ['jpg', 'jpeg']:
+                        pix.save(output_path, output='jpeg', jpg_quality=image_quality)
+                    else:
+                        img = Image.frombuffer('RGB', (pix.width, pix.height), pix.samples_mv, 'raw', 'RGB', pix.stride, 1)
+                        img.save(output_path, format=pil_format(target_format))
                 
-                doc.close()
                 return True
             
             return False
@@ -283,22 +665,28 @@ class FileConverter:
             with Image.open(input_path) as img:
                 width, height = img.size
                 
-                # Create a simple SVG that embeds the image as base64
-                import base64
-                import io
-                
-                # Convert image to base64
-                buffer = io.BytesIO()
-                img.save(buffer, format='PNG')
-                img_base64 = base64.b64encode(buffer.getvalue()).decode()
+                # Create a simple SVG that embeds the image as base64. Formats
+                # viewers understand are embedded byte for byte; others are
+                # encoded to PNG in memory first
+                mime_type = SVG_EMBED_TYPES.get(img.format)
+                if mime_type is None:
+                    mime_type = 'image/png'
+                    source = io.BytesIO()
+                    img.save(source, format='PNG')
+                    source.seek(0)
+                else:
+                    source = open(input_path, 'rb')
                 
-                svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+                # base64 is written a chunk at a time instead of building the
+                # whole (a third larger) payload as one string
+                with source, open(output_path, 'wb') as f:
+                    f.write(f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
-    <image width="{width}" height="{height}" href="data:image/png;base64,{img_base64}"/>
-</svg>'''
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(svg_content)
+    <image width="{width}" height="{height}" href="data:{mime_type};base64,'''.encode())
+                    while chunk := source.read(BASE64_CHUNK_SIZE):
+                        f.write(base64.b64encode(chunk))
+                    f.write(b'''"/>
+</svg>''')
                 
                 return True
                 
@@ -310,22 +698,29 @@ class FileConverter:
         """Convert SVG to other image formats"""
         try:
             # Try using cairosvg if available and Cairo is installed
-            try:
-                import cairosvg
-                cairosvg.svg2png(url=input_path, write_to=output_path.replace(f'.{target_format}', '.png'))
-                
-                # If target format is not PNG, convert the PNG to target format
-                if target_format != 'png':
-                    temp_png = output_path.replace(f'.{target_format}', '.png')
-                    if os.path.exists(temp_png):
-                        with Image.open(temp_png) as img:
-                            img.save(output_path, format=target_format.upper())
-                        os.remove(temp_png)
-                
-                return True
-                
-            except (ImportError, OSError) as e:
-                logger.warning(f"cairosvg not available or Cairo library missing: {str(e)}")
+            cairosvg = None
+            if self.cairosvg_available:
+                try:
+                    import cairosvg
+                except (ImportError, OSError) as e:
+                    # Loading the Cairo library failed; don't retry it on every SVG
+                    self.cairosvg_available = False
+                    logger.warning(f"cairosvg not available or Cairo library missing: {str(e)}")
+            
+            if cairosvg is not None:
+                try:
+                    if target_format == 'png':
+                        cairosvg.svg2png(url=input_path, write_to=output_path)
+                    else:
+                        # Render in memory and re-encode, without a temporary PNG file
+                        with Image.open(io.BytesIO(cairosvg.svg2png(url=input_path))) as img:
+                            img.save(output_path, format=pil_format(target_format))
+                    
+                    return True
+                    
+                except Exception as e:
+                    # Only this file failed; cairosvg stays enabled for the next one
+                    logger.warning(f"cairosvg could not convert {input_path}, trying svglib: {str(e)}")
             
             # Fallback: try using svglib if available
             try:
@@ -344,7 +739,7 @@ class FileConverter:
             if self.pil_available:
                 # Create a simple colored rectangle as placeholder
                 img = Image.new('RGB', (800, 600), color='white')
-                img.save(output_path, format=target_format.upper())
+                img.save(output_path, format=pil_format(target_format))
                 logger.warning("SVG conversion using fallback method - result may be basic")
                 return True
             
@@ -357,7 +752,7 @@ class FileConverter:
     def _convert_document(self, input_path: str, output_path: str, target_format: str) -> bool:
         """Convert between document formats"""
         try:
-            input_ext = Path(input_path).suffix[1:].lower()
+            input_ext = file_extension(input_path)
             
             # Simple text-based conversions
             if input_ext == 'txt' and target_format == 'html':
@@ -369,6 +764,12 @@ class FileConverter:
             elif input_ext == 'md' and target_format == 'txt':
                 return self._convert_markdown_to_text(input_path, output_path)
             
+            # PDF input and output have their own converters
+            if input_ext == 'pdf':
+                return self._convert_from_pdf(input_path, output_path, target_format)
+            elif target_format == 'pdf':
+                return self._convert_to_pdf(input_path, output_path)
+            
             # For other conversions, try to extract text and convert
             if target_format == 'txt':
                 return self._extract_text_to_file(input_path, output_path)
@@ -384,7 +785,7 @@ class FileConverter:
     def _convert_spreadsheet(self, input_path: str, output_path: str, target_format: str) -> bool:
         """Convert between spreadsheet formats"""
         try:
-            input_ext = Path(input_path).suffix[1:].lower()
+            input_ext = file_extension(input_path)
             
             if input_ext == 'csv' and target_format == 'json':
                 return self._convert_csv_to_json(input_path, output_path)
@@ -402,7 +803,7 @@ class FileConverter:
     def _convert_data_format(self, input_path: str, output_path: str, target_format: str) -> bool:
         """Convert between data formats"""
         try:
-            input_ext = Path(input_path).suffix[1:].lower()
+            input_ext = file_extension(input_path)
             
             if input_ext == 'json' and target_format == 'xml':
                 return self._convert_json_to_xml(input_path, output_path)
@@ -423,15 +824,14 @@ class FileConverter:
         """Convert between code formats (mostly syntax highlighting)"""
         try:
             # For code files, we'll just copy the content with appropriate headers
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
             if target_format == 'html':
+                with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as f:
+                    content = f.read()
                 return self._convert_code_to_html(input_path, output_path, content)
             elif target_format == 'txt':
                 # Just copy the content
                 with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    self._copy_text(input_path, f)
                 return True
             
             return False
@@ -444,20 +844,14 @@ class FileConverter:
         """Convert PDF to text"""
         try:
             if self.pymupdf_available:
-                import fitz
-                doc = fitz.open(input_path)
-                text_content = ""
-                
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    text_content += page.get_text()
-                    if page_num < len(doc) - 1:
-                        text_content += "\n\n"
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content)
+                # Write each page as it is extracted rather than building the
+                # whole document's text in memory first
+                with fitz.open(input_path) as doc, open(output_path, 'w', encoding='utf-8') as f:
+                    for page_num, text in enumerate(self._iter_page_texts(doc, input_path)):
+                        if page_num:
+                            f.write("\n\n")
+                        f.write(text)
                 
-                doc.close()
                 return True
             
             return False
@@ -479,46 +873,61 @@ class FileConverter:
     def _convert_pdf_to_docx_with_libraries(self, input_path: str, output_path: str) -> bool:
         """Convert PDF to DOCX using PyMuPDF + python-docx"""
         try:
-            import fitz
             from docx import Document
-            from docx.shared import Inches
+            from docx.oxml import parse_xml
+            from docx.oxml.ns import nsdecls
             
-            # Extract text from PDF
-            doc = fitz.open(input_path)
             document = Document()
             
             # Add title
             document.add_heading('Converted PDF Document', 0)
             
-            # Process each page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                
-                if text.strip():
-                    # Split text into paragraphs
-                    paragraphs = text.split('\n\n')
-                    
-                    for para in paragraphs:
-                        if para.strip():
-                            # Clean up the paragraph
-                            clean_para = para.strip().replace('\n', ' ')
-                            if clean_para:
-                                document.add_paragraph(clean_para)
-                    
-                    # Add page break if not the last page
-                    if page_num < len(doc) - 1:
-                        document.add_page_break()
+            # The body is assembled as WordprocessingML text and parsed in one go;
+            # python-docx's add_paragraph builds each run a character at a time
+            body_xml = []
+            
+            # Extract text from PDF, one page at a time
+            with fitz.open(input_path) as doc:
+                for page_num, text in enumerate(self._iter_page_texts(doc, input_path)):
+                    if text.strip():
+                        # Split text into paragraphs
+                        paragraphs = text.split('\n\n')
+                        
+                        for para in paragraphs:
+                            if para.strip():
+                                # Clean up the paragraph
+                                clean_para = para.strip().replace('\n', ' ')
+                                if clean_para:
+                                    body_xml.append(self._docx_paragraph_xml(clean_para))
+                        
+                        # Add page break if not the last page
+                        if page_num < len(doc) - 1:
+                            body_xml.append(DOCX_PAGE_BREAK_XML)
+            
+            # Insert before the final section properties, as add_paragraph does
+            body = document.element.body
+            section_properties = body.sectPr
+            for element in list(parse_xml(f'<w:body {nsdecls("w")}>{"".join(body_xml)}</w:body>')):
+                if section_properties is not None:
+                    section_properties.addprevious(element)
+                else:
+                    body.append(element)
             
             # Save the DOCX file
             document.save(output_path)
-            doc.close()
             return True
             
         except Exception as e:
             logger.error(f"PDF to DOCX with libraries error: {str(e)}")
             return False
     
+    def _docx_paragraph_xml(self, text: str) -> str:
+        """WordprocessingML for a plain paragraph of text"""
+        text = xml_escape(XML_INVALID_CHARS_RE.sub('', text))
+        # Tabs are their own run element, as python-docx writes them
+        text = text.replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">')
+        return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+    
     def _convert_text_to_pdf(self, input_path: str, output_path: str) -> bool:
         """Convert text to PDF"""
         try:
@@ -533,44 +942,57 @@ class FileConverter:
     def _convert_text_to_pdf_reportlab(self, input_path: str, output_path: str) -> bool:
         """Convert text to PDF using ReportLab"""
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
-            
             # Read text file
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as f:
                 content = f.read()
             
-            # Create PDF document
-            doc = SimpleDocTemplate(
-                output_path,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18
-            )
-            
-            styles = getSampleStyleSheet()
-            story = []
-            
             # Split content into paragraphs
-            paragraphs = content.split('\n\n')
-            
-            for para in paragraphs:
-                if para.strip():
-                    clean_para = para.strip().replace('\n', ' ')
-                    p = Paragraph(clean_para, styles['Normal'])
-                    story.append(p)
-                    story.append(Spacer(1, 12))
-            
-            doc.build(story)
+            self._render_paragraphs_to_pdf(content.split('\n\n'), output_path)
             return True
             
         except Exception as e:
             logger.error(f"ReportLab text to PDF error: {str(e)}")
             return False
     
+    def _render_paragraphs_to_pdf(self, paragraphs, output_path: str):
+        """Lay out plain-text paragraphs as an A4 PDF with ReportLab"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.pdfgen import canvas
+        
+        # Plain text needs only word wrapping, so lines are drawn straight onto
+        # the canvas instead of going through Paragraph flowables and the
+        # platypus layout engine. The page geometry matches the old
+        # SimpleDocTemplate layout: 72pt margins (18pt at the bottom) and the
+        # Normal style's 10pt Helvetica on 12pt leading
+        font_name, font_size, leading = 'Helvetica', 10, 12
+        page_width, page_height = A4
+        left = 72 + 6
+        width = page_width - 2 * left
+        top = page_height - 72 - 6
+        bottom = 18 + 6
+        
+        pdf = canvas.Canvas(output_path, pagesize=A4)
+        pdf.setFont(font_name, font_size)
+        y = top
+        
+        for para in paragraphs:
+            if not para.strip():
+                continue
+            
+            # Paragraph spacing is dropped at the top of a page
+            if y != top:
+                y -= leading
+            for line in simpleSplit(' '.join(para.split()), font_name, font_size, width):
+                if y - leading < bottom:
+                    pdf.showPage()
+                    pdf.setFont(font_name, font_size)
+                    y = top
+                y -= leading
+                pdf.drawString(left, y + leading - font_size, line)
+        
+        pdf.save()
+    
     def _convert_docx_to_pdf(self, input_path: str, output_path: str) -> bool:
         """Convert DOCX to PDF"""
         try:
@@ -586,31 +1008,11 @@ class FileConverter:
         """Convert DOCX to PDF using python-docx + ReportLab"""
         try:
             from docx import Document
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
             
-            # Extract text from DOCX
+            # Lay the DOCX paragraphs out directly, without a temporary text file
             doc = Document(input_path)
-            content = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    content.append(paragraph.text.strip())
-            
-            # Create temporary text file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as temp_file:
-                temp_file.write('\n\n'.join(content))
-                temp_path = temp_file.name
-            
-            try:
-                # Convert using ReportLab
-                result = self._convert_text_to_pdf_reportlab(temp_path, output_path)
-                return result
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            self._render_paragraphs_to_pdf((paragraph.text for paragraph in doc.paragraphs), output_path)
+            return True
                     
         except Exception as e:
             logger.error(f"DOCX to PDF ReportLab error: {str(e)}")
@@ -639,29 +1041,36 @@ class FileConverter:
             return False
     
     # Helper conversion methods
+    def _text_encoding(self, input_path: str) -> str:
+        """Guess a text file's encoding from its first few KB"""
+        with open(input_path, 'rb') as f:
+            head = f.read(TEXT_SNIFF_SIZE)
+        
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        try:
+            # Incremental, so a character cut off at the end of the sample is fine
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            # Not UTF-8: most likely a Windows-1252 (or Latin-1) export
+            return 'cp1252'
+    
+    def _copy_text(self, input_path: str, out, escape: bool = False):
+        """Copy a text file into an open output file a chunk at a time, optionally HTML-escaped"""
+        with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as f:
+            while chunk := f.read(TEXT_CHUNK_SIZE):
+                out.write(html.escape(chunk, quote=False) if escape else chunk)
+    
     def _convert_text_to_html(self, input_path: str, output_path: str) -> bool:
         """Convert text to HTML"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Converted Document</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        pre {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
-    </style>
-</head>
-<body>
-    <pre>{content}</pre>
-</body>
-</html>"""
-            
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                f.write(TEXT_HTML_HEADER)
+                self._copy_text(input_path, f, escape=True)
+                f.write(TEXT_HTML_FOOTER)
             
             return True
         except Exception as e:
@@ -671,18 +1080,35 @@ class FileConverter:
     def _convert_html_to_text(self, input_path: str, output_path: str) -> bool:
         """Convert HTML to text"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Simple HTML to text conversion
-            import re
-            # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', content)
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            # Simple HTML to text conversion: drop tags and collapse whitespace
+            # runs to single spaces, one chunk at a time
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as src, \
+                    open(output_path, 'w', encoding='utf-8') as out:
+                pending = ''  # an unclosed tag carried into the next chunk
+                wrote_text = False
+                space_pending = False
+                while True:
+                    chunk = src.read(TEXT_CHUNK_SIZE)
+                    data = pending + chunk
+                    pending = ''
+                    if chunk:
+                        tag_start = data.find('<', data.rfind('>') + 1)
+                        if tag_start != -1:
+                            data, pending = data[:tag_start], data[tag_start:]
+                    
+                    text = HTML_TAG_RE.sub('', data)
+                    words = text.split()
+                    if words:
+                        if wrote_text and (space_pending or text[0].isspace()):
+                            out.write(' ')
+                        out.write(' '.join(words))
+                        wrote_text = True
+                        space_pending = text[-1].isspace()
+                    elif text:
+                        space_pending = True
+                    
+                    if not chunk:
+                        break
             
             return True
         except Exception as e:
@@ -692,29 +1118,26 @@ class FileConverter:
     def _convert_markdown_to_html(self, input_path: str, output_path: str) -> bool:
         """Convert Markdown to HTML"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
             # Simple markdown to HTML conversion
-            html_content = f"""<!DOCTYPE html>
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <title>Converted Markdown</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        h1, h2, h3 {{ color: #333; }}
-        code {{ background-color: #f5f5f5; padding: 2px 4px; border-radius: 3px; }}
-        pre {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
+        body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+        h1, h2, h3 { color: #333; }
+        code { background-color: #f5f5f5; padding: 2px 4px; border-radius: 3px; }
+        pre { background-color: #f5f5f5; padding: 15px; border-radius: 5px; }
     </style>
 </head>
 <body>
-    <pre>{content}</pre>
+    <pre>""")
+                self._copy_text(input_path, f, escape=True)
+                f.write("""</pre>
 </body>
-</html>"""
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+</html>""")
             
             return True
         except Exception as e:
@@ -724,17 +1147,14 @@ class FileConverter:
     def _convert_markdown_to_text(self, input_path: str, output_path: str) -> bool:
         """Convert Markdown to text"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as f:
                 content = f.read()
             
             # Simple markdown to text conversion
-            import re
             # Remove markdown syntax
-            text = re.sub(r'#+\s*', '', content)  # Remove headers
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # Remove bold
-            text = re.sub(r'\*(.*?)\*', r'\1', text)  # Remove italic
-            text = re.sub(r'`(.*?)`', r'\1', text)  # Remove inline code
-            text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)  # Remove links
+            text = content
+            for pattern, replacement in MARKDOWN_STRIP_PATTERNS:
+                text = pattern.sub(replacement, text)
             
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(text)
@@ -744,17 +1164,50 @@ class FileConverter:
             logger.error(f"Markdown to text error: {str(e)}")
             return False
     
+    def _read_json(self, input_path: str):
+        """Parse a JSON file"""
+        with open(input_path, 'rb') as f:
+            raw = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # orjson is stricter (invalid UTF-8, NaN); let the json module decide
+                pass
+        return json.loads(raw.decode('utf-8', errors='ignore'))
+    
+    def _dumps_json(self, data) -> str:
+        """Serialize data as JSON indented by two spaces"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+            except TypeError:
+                # Values orjson can't encode, such as integers over 64 bits
+                pass
+        return json.dumps(data, indent=2)
+    
+    def _dump_json_bytes(self, data) -> bytes:
+        """Serialize data as UTF-8 JSON indented by two spaces, for binary files"""
+        if orjson is not None:
+            try:
+                # orjson already produces UTF-8; skip decoding and re-encoding it
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            except TypeError:
+                pass
+        return json.dumps(data, indent=2).encode('utf-8')
+    
     def _convert_csv_to_json(self, input_path: str, output_path: str) -> bool:
         """Convert CSV to JSON"""
         try:
-            data = []
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Write each row as it is read rather than building the whole list
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as src, \
+                    open(output_path, 'w', encoding='utf-8') as out:
+                out.write('[')
+                separator = '\n  '
+                for row in csv.DictReader(src):
+                    out.write(separator + self._dumps_json(row).replace('\n', '\n  '))
+                    separator = ',\n  '
+                out.write(']' if separator == '\n  ' else '\n]')
             
             return True
         except Exception as e:
@@ -764,26 +1217,45 @@ class FileConverter:
     def _convert_json_to_csv(self, input_path: str, output_path: str) -> bool:
         """Convert JSON to CSV"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                data = json.load(f)
-            
-            if isinstance(data, list) and len(data) > 0:
-                fieldnames = data[0].keys()
-                with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(data)
-                return True
+            if self.ijson_available:
+                # Read the top-level array one record at a time
+                import ijson
+                with open(input_path, 'rb') as f:
+                    return self._write_csv_rows(ijson.items(f, 'item', use_float=True), output_path)
+            
+            data = self._read_json(input_path)
+            
+            if isinstance(data, list):
+                return self._write_csv_rows(iter(data), output_path)
             return False
         except Exception as e:
             logger.error(f"JSON to CSV error: {str(e)}")
             return False
     
+    def _write_csv_rows(self, rows, output_path: str) -> bool:
+        """Write dict rows as CSV, with the first row's keys as the header"""
+        first = next(rows, None)
+        if first is None:
+            return False
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=first.keys())
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
+        return True
+    
     def _convert_json_to_xml(self, input_path: str, output_path: str) -> bool:
         """Convert JSON to XML"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                data = json.load(f)
+            if self.ijson_available and self._json_is_array(input_path):
+                # Convert the top-level array one element at a time
+                import ijson
+                with open(input_path, 'rb') as f:
+                    self._write_xml_items(ijson.items(f, 'item', use_float=True), output_path)
+                return True
+            
+            data = self._read_json(input_path)
             
             root = ET.Element("root")
             self._dict_to_xml(data, root)
@@ -795,16 +1267,32 @@ class FileConverter:
             logger.error(f"JSON to XML error: {str(e)}")
             return False
     
+    def _json_is_array(self, input_path: str) -> bool:
+        """Whether a JSON file's top-level value is an array"""
+        with open(input_path, 'rb') as f:
+            return f.read(TEXT_SNIFF_SIZE).lstrip().startswith(b'[')
+    
+    def _write_xml_items(self, items, output_path: str):
+        """Write array elements as <item>s of a <root> document, as _dict_to_xml would lay them out"""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            empty = True
+            for value in items:
+                if empty:
+                    f.write('<root>')
+                    empty = False
+                item = ET.Element("item")
+                self._dict_to_xml(value, item)
+                f.write(ET.tostring(item, encoding='unicode'))
+            f.write('<root />' if empty else '</root>')
+    
     def _convert_xml_to_json(self, input_path: str, output_path: str) -> bool:
         """Convert XML to JSON"""
         try:
-            tree = ET.parse(input_path)
-            root = tree.getroot()
+            data = self._xml_to_dict(input_path)
             
-            data = self._xml_to_dict(root)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(self._dump_json_bytes(data))
             return True
         except Exception as e:
             logger.error(f"XML to JSON error: {str(e)}")
@@ -813,22 +1301,29 @@ class FileConverter:
     def _convert_csv_to_xml(self, input_path: str, output_path: str) -> bool:
         """Convert CSV to XML"""
         try:
-            import csv
-            import xml.etree.ElementTree as ET
-            
-            root = ET.Element("data")
-            
-            with open(input_path, 'r', encoding='utf-8', newline='') as csvfile:
+            # Each record is written as text as soon as it is read, instead of
+            # building an element tree for the whole file; the markup matches
+            # what ElementTree wrote
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), newline='') as csvfile, \
+                    open(output_path, 'w', encoding='utf-8') as xmlfile:
                 reader = csv.DictReader(csvfile)
+                tags = {}
                 
+                xmlfile.write("<?xml version='1.0' encoding='utf-8'?>\n")
+                empty = True
                 for row in reader:
-                    record = ET.SubElement(root, "record")
+                    if empty:
+                        xmlfile.write('<data>')
+                        empty = False
+                    
+                    parts = ['<record>']
                     for key, value in row.items():
-                        field = ET.SubElement(record, key.replace(' ', '_').lower())
-                        field.text = str(value) if value else ""
+                        tag = tags.get(key) or tags.setdefault(key, key.replace(' ', '_').lower())
+                        parts.append(f'<{tag}>{xml_escape(value)}</{tag}>' if value else f'<{tag} />')
+                    parts.append('</record>')
+                    xmlfile.write(''.join(parts))
+                xmlfile.write('<data />' if empty else '</data>')
             
-            tree = ET.ElementTree(root)
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
             return True
             
         except Exception as e:
@@ -838,16 +1333,15 @@ class FileConverter:
     def _convert_spreadsheet_to_pdf(self, input_path: str, output_path: str) -> bool:
         """Convert spreadsheet files to PDF"""
         try:
-            input_ext = Path(input_path).suffix[1:].lower()
-            
-            if input_ext == 'csv':
-                # Convert CSV to text first, then to PDF
-                temp_txt = output_path.replace('.pdf', '.txt')
-                if self._convert_csv_to_text(input_path, temp_txt):
-                    result = self._convert_text_to_pdf(temp_txt, output_path)
-                    if os.path.exists(temp_txt):
-                        os.remove(temp_txt)
-                    return result
+            input_ext = file_extension(input_path)
+            
+            if input_ext == 'csv' and self.reportlab_available:
+                # Lay out the rows as CSV to text would write them, without the
+                # temporary text file
+                with open(input_path, 'r', encoding=self._text_encoding(input_path), newline='') as csvfile:
+                    content = ''.join(' | '.join(row) + '\n' for row in csv.reader(csvfile))
+                self._render_paragraphs_to_pdf(content.split('\n\n'), output_path)
+                return True
             
             return False
             
@@ -858,14 +1352,12 @@ class FileConverter:
     def _convert_csv_to_text(self, input_path: str, output_path: str) -> bool:
         """Convert CSV to formatted text"""
         try:
-            import csv
-            
-            with open(input_path, 'r', encoding='utf-8', newline='') as csvfile:
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), newline='') as csvfile:
                 reader = csv.reader(csvfile)
                 
+                # csv.reader already yields lists of str, so rows are joined as they are
                 with open(output_path, 'w', encoding='utf-8') as txtfile:
-                    for row in reader:
-                        txtfile.write(' | '.join(str(cell) for cell in row) + '\n')
+                    txtfile.writelines(' | '.join(row) + '\n' for row in reader)
             
             return True
             
@@ -876,25 +1368,16 @@ class FileConverter:
     def _convert_pdf_to_doc(self, input_path: str, output_path: str) -> bool:
         """Convert PDF to DOC format (simple text-based approach)"""
         try:
-            # Convert PDF to text first
-            temp_txt = output_path.replace('.doc', '.txt')
-            if self._convert_pdf_to_text(input_path, temp_txt):
-                # Create a simple RTF-like document
-                with open(temp_txt, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Create a simple document format
-                doc_content = f"""{{\\rtf1\\ansi\\deff0 {{\\fonttbl {{\\f0 Times New Roman;}}}}
-\\f0\\fs24
-{content.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')}
-}}"""
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(doc_content)
-                
-                # Clean up temp file
-                if os.path.exists(temp_txt):
-                    os.remove(temp_txt)
+            if self.pymupdf_available:
+                # Create a simple RTF-like document, writing each page's text
+                # as it is extracted instead of via a temporary text file
+                with fitz.open(input_path) as doc, open(output_path, 'w', encoding='utf-8') as f:
+                    f.write("{\\rtf1\\ansi\\deff0 {\\fonttbl {\\f0 Times New Roman;}}\n\\f0\\fs24\n")
+                    for page_num, text in enumerate(self._iter_page_texts(doc, input_path)):
+                        if page_num:
+                            f.write("\n\n")
+                        f.write(text.translate(RTF_ESCAPE_TABLE))
+                    f.write("\n}")
                 
                 return True
             
@@ -907,13 +1390,16 @@ class FileConverter:
     def _convert_code_to_html(self, input_path: str, output_path: str, content: str) -> bool:
         """Convert code to HTML with syntax highlighting"""
         try:
-            file_ext = Path(input_path).suffix[1:].lower()
+            file_ext = file_extension(input_path)
+            # File contents and names are user input; escape them in one pass each
+            file_name = html.escape(Path(input_path).name)
+            content = html.escape(content, quote=False)
             
             html_content = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
-    <title>Code: {Path(input_path).name}</title>
+    <title>Code: {file_name}</title>
     <style>
         body {{ font-family: 'Courier New', monospace; margin: 40px; background-color: #f8f8f8; }}
         pre {{ background-color: #ffffff; padding: 20px; border-radius: 5px; border: 1px solid #ddd; overflow-x: auto; }}
@@ -921,7 +1407,7 @@ class FileConverter:
     </style>
 </head>
 <body>
-    <div class="filename">File: {Path(input_path).name}</div>
+    <div class="filename">File: {file_name}</div>
     <pre><code>{content}</code></pre>
 </body>
 </html>"""
@@ -937,11 +1423,10 @@ class FileConverter:
     def _extract_text_to_file(self, input_path: str, output_path: str) -> bool:
         """Extract text from various file formats"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
+            # Streamed through in chunks; the input may be in another encoding,
+            # so it is decoded and rewritten as UTF-8 rather than copied as is
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+                self._copy_text(input_path, f)
             
             return True
         except Exception as e:
@@ -951,8 +1436,8 @@ class FileConverter:
     def _convert_to_html(self, input_path: str, output_path: str) -> bool:
         """Convert various formats to HTML"""
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(input_path, 'r', encoding=self._text_encoding(input_path), errors='ignore') as f:
+                content = html.escape(f.read(), quote=False)
             
             html_content = f"""<!DOCTYPE html>
 <html>
@@ -980,9 +1465,9 @@ class FileConverter:
     def _convert_to_pdf(self, input_path: str, output_path: str) -> bool:
         """Convert various formats to PDF"""
         try:
-            # Extract text and convert to PDF
-            return self._extract_text_to_file(input_path, output_path.replace('.pdf', '.txt')) and \
-                   self._convert_text_to_pdf(output_path.replace('.pdf', '.txt'), output_path)
+            # The input is laid out as plain text, read directly rather than
+            # copied to a temporary text file first
+            return self._convert_text_to_pdf(input_path, output_path)
         except Exception as e:
             logger.error(f"Convert to PDF error: {str(e)}")
             return False
@@ -992,14 +1477,16 @@ class FileConverter:
         try:
             if target_format == 'txt':
                 return self._convert_pdf_to_text(input_path, output_path)
-            elif target_format == 'html':
-                # Convert to text first, then to HTML
-                temp_txt = output_path.replace('.html', '.txt')
-                if self._convert_pdf_to_text(input_path, temp_txt):
-                    result = self._convert_text_to_html(temp_txt, output_path)
-                    if os.path.exists(temp_txt):
-                        os.remove(temp_txt)
-                    return result
+            elif target_format == 'html' and self.pymupdf_available:
+                # Page text goes straight into the page, as PDF to text would write it
+                with fitz.open(input_path) as doc, open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(TEXT_HTML_HEADER)
+                    for page_num, text in enumerate(self._iter_page_texts(doc, input_path)):
+                        if page_num:
+                            f.write("\n\n")
+                        f.write(html.escape(text, quote=False))
+                    f.write(TEXT_HTML_FOOTER)
+                return True
             return False
         except Exception as e:
             logger.error(f"Convert from PDF error: {str(e)}")
@@ -1018,79 +1505,27 @@ class FileConverter:
         else:
             parent.text = str(data)
     
-    def _xml_to_dict(self, element):
-        """Helper method to convert XML to dictionary"""
-        result = {}
-        for child in element:
-            if len(child) == 0:
-                result[child.tag] = child.text
-            else:
-                result[child.tag] = self._xml_to_dict(child)
-        return result
+    def _xml_to_dict(self, input_path: str) -> dict:
+        """Helper method to convert an XML file to a dictionary"""
+        # Build the dictionaries while parsing and clear each element once it
+        # is done, so the document is never held as a full element tree too
+        stack = [{}]
+        for event, elem in ET.iterparse(input_path, events=('start', 'end')):
+            if event == 'start':
+                stack.append({})
+                continue
+            
+            result = stack.pop()
+            if len(stack) == 1:
+                return result
+            stack[-1][elem.tag] = elem.text if len(elem) == 0 else result
+            elem.clear()
+        return stack[0]
     
     def get_supported_formats(self) -> dict:
         """Get all supported format conversions"""
-        return {
-            'image_formats': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg'],
-            'document_formats': ['pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm'],
-            'spreadsheet_formats': ['xlsx', 'xls', 'csv'],
-            'presentation_formats': ['pptx', 'ppt'],
-            'data_formats': ['json', 'xml'],
-            'code_formats': ['py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml']
-        }
+        return SUPPORTED_FORMATS
     
-    def get_conversion_options(self, input_format: str) -> list:
+    def get_conversion_options(self, input_format: str) -> tuple:
         """Get available conversion options for a given input format"""
-        format_mappings = {
-            # Image formats
-            'jpg': ['png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'],
-            'jpeg': ['png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'],
-            'png': ['jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'],
-            'gif': ['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'],
-            'bmp': ['jpg', 'jpeg', 'png', 'gif', 'tiff', 'tif', 'webp', 'ico', 'svg', 'pdf'],
-            'tiff': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'ico', 'svg', 'pdf'],
-            'tif': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'ico', 'svg', 'pdf'],
-            'webp': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'ico', 'svg', 'pdf'],
-            'ico': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'svg', 'pdf'],
-            'svg': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'pdf'],
-            
-            # Document formats
-            'pdf': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg', 'txt', 'html', 'docx', 'doc'],
-            'txt': ['pdf', 'html', 'md'],
-            'docx': ['pdf', 'txt', 'html'],
-            'doc': ['pdf', 'txt', 'html'],
-            'rtf': ['pdf', 'txt', 'html'],
-            'md': ['pdf', 'html', 'txt'],
-            'html': ['pdf', 'txt', 'md'],
-            'htm': ['pdf', 'txt', 'md'],
-            
-            # Spreadsheet formats
-            'xlsx': ['csv', 'json', 'xml', 'pdf'],
-            'xls': ['csv', 'json', 'xml', 'pdf'],
-            'csv': ['json', 'xml', 'pdf'],
-            
-            # Data formats
-            'json': ['xml', 'csv'],
-            'xml': ['json', 'csv'],
-            
-            # Code formats
-            'py': ['html', 'txt'],
-            'js': ['html', 'txt'],
-            'css': ['html', 'txt'],
-            'php': ['html', 'txt'],
-            'java': ['html', 'txt'],
-            'cpp': ['html', 'txt'],
-            'c': ['html', 'txt'],
-            'cs': ['html', 'txt'],
-            'rb': ['html', 'txt'],
-            'go': ['html', 'txt'],
-            'rs': ['html', 'txt'],
-            'log': ['html', 'txt'],
-            'ini': ['html', 'txt'],
-            'cfg': ['html', 'txt'],
-            'conf': ['html', 'txt'],
-            'yaml': ['html', 'txt'],
-            'yml': ['html', 'txt'],
-            'toml': ['html', 'txt']
-        }
-        return format_mappings.get(input_format.lower(), []) 
\ No newline at end of file
+        return CONVERSION_OPTIONS.get(input_format.lower(), ()) 
\ No newline at end of file
@@ -1,45 +1,135 @@
 import os
+import time
 import shutil
+import hashlib
 import logging
+import tempfile
 from pathlib import Path
 from werkzeug.datastructures import FileStorage
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+def file_extension(path: str) -> str:
+    """Lower-cased extension without the dot, same as Path(path).suffix[1:]"""
+    name = os.path.basename(path)
+    dot = name.rfind('.')
+    return name[dot + 1:].lower() if 0 < dot < len(name) - 1 else ''
+
+def link_or_copy(source: str, destination: str):
+    """Hard-link source to destination, or copy it where links are not supported"""
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        logger.debug(f"Could not link {source}: {e}")
+        # copyfile uses sendfile(2)/fcopyfile, so the bytes stay in the kernel
+        shutil.copyfile(source, destination)
+
+class HashingStream:
+    """File wrapper that hashes everything written through it"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._digest = hashlib.sha256()
+    
+    def write(self, data):
+        self._digest.update(data)
+        return self._stream.write(data)
+    
+    def hexdigest(self) -> str:
+        """SHA-256 of the bytes written so far"""
+        return self._digest.hexdigest()
+    
+    def __iter__(self):
+        return iter(self._stream)
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
 class FileHandler:
     """Handles file operations for the application"""
     
     def __init__(self):
         self.upload_folder = Config.UPLOAD_FOLDER
         self.converted_folder = Config.CONVERTED_FOLDER
+        self.chunk_size = Config.UPLOAD_CHUNK_SIZE
         
         # Create directories if they don't exist
         os.makedirs(self.upload_folder, exist_ok=True)
         os.makedirs(self.converted_folder, exist_ok=True)
     
+    def create_upload_spool(self, total_content_length: int = None):
+        """Create the file object Werkzeug streams an uploaded file part into"""
+        # Every upload goes straight to disk next to its final location, so no
+        # file body is held in memory and save_uploaded_file can link it into
+        # place instead of copying. The large buffer batches the parser's
+        # 64KB writes into chunk_size write() calls
+        spool = tempfile.NamedTemporaryFile('wb+', buffering=self.chunk_size, dir=self.upload_folder,
+                                            prefix='.upload-', suffix='.part')
+        
+        # Hash while the parser writes so the content digest costs no extra read
+        return HashingStream(spool)
+    
+    def upload_digest(self, file: FileStorage) -> str:
+        """SHA-256 computed while the upload was parsed, or None if unavailable"""
+        stream = file.stream
+        return stream.hexdigest() if isinstance(stream, HashingStream) else None
+    
     def save_uploaded_file(self, file: FileStorage, filename: str) -> str:
         """Save uploaded file to upload folder"""
         try:
             file_path = os.path.join(self.upload_folder, filename)
-            file.save(file_path)
+            spool_path = getattr(file.stream, 'name', None)
+            
+            if isinstance(spool_path, str) and self._place_spooled_file(file, spool_path, file_path):
+                logger.info(f"File saved: {filename} (from spool)")
+                return file_path
+            
+            # Large chunks keep the number of write() syscalls low for big uploads
+            file.save(file_path, buffer_size=self.chunk_size)
             logger.info(f"File saved: {filename}")
             return file_path
         except Exception as e:
             logger.error(f"Error saving file {filename}: {e}")
             raise
     
+    def _place_spooled_file(self, file: FileStorage, spool_path: str, file_path: str) -> bool:
+        """Link (or kernel-copy) a spooled upload to its final name; False if that failed"""
+        try:
+            file.stream.flush()
+        except (OSError, AttributeError) as e:
+            logger.debug(f"Could not flush spooled upload {spool_path}: {e}")
+            return False
+        
+        try:
+            link_or_copy(spool_path, file_path)
+            return True
+        except OSError as e:
+            logger.debug(f"Could not copy spooled upload {spool_path}: {e}")
+            return False
+    
     def get_output_path(self, filename: str) -> str:
         """Get full path for output file"""
         return os.path.join(self.converted_folder, filename)
     
+    def find_converted_file(self, unique_id: str) -> str:
+        """Find the converted file produced for an upload id, if any"""
+        prefix = f"{unique_id}_converted_"
+        try:
+            for filename in os.listdir(self.converted_folder):
+                if filename.startswith(prefix):
+                    return filename
+        except OSError as e:
+            logger.error(f"Error accessing folder {self.converted_folder}: {e}")
+        return None
+    
     def delete_file(self, file_path: str) -> bool:
         """Delete a file safely"""
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"File deleted: {file_path}")
-                return True
+            os.remove(file_path)
+            logger.info(f"File deleted: {file_path}")
+            return True
+        except FileNotFoundError:
             return False
         except Exception as e:
             logger.error(f"Error deleting file {file_path}: {e}")
@@ -59,27 +149,26 @@ class FileHandler:
     def cleanup_old_files(self, max_age_seconds: int = None) -> int:
         """Clean up old files from both upload and converted folders"""
         if max_age_seconds is None:
-            max_age_seconds = Config.FILE_RETENTION_TIME
+            max_age_seconds = Config.FILE_RETENTION_HOURS * 3600
         
         deleted_count = 0
-        current_time = os.path.getmtime(__file__)  # Use current time
+        cutoff_ns = time.time_ns() - max_age_seconds * 1_000_000_000
         
         for folder in [self.upload_folder, self.converted_folder]:
             try:
-                for filename in os.listdir(folder):
-                    file_path = os.path.join(folder, filename)
-                    try:
-                        file_age = current_time - os.path.getmtime(file_path)
-                        if file_age > max_age_seconds:
-                            if self.delete_file(file_path):
-                                deleted_count += 1
-                    except OSError:
-                        # File might have been deleted by another process
-                        continue
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime_ns < cutoff_ns:
+                                if self.delete_file(entry.path):
+                                    deleted_count += 1
+                        except OSError:
+                            # File might have been deleted by another process
+                            continue
             except OSError as e:
                 logger.error(f"Error accessing folder {folder}: {e}")
         
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old files")
         
-        return deleted_count 
\ No newline at end of file
+        return deleted_count
@@ -0,0 +1,109 @@
+import json
+import logging
+import itertools
+import threading
+import subprocess
+from concurrent.futures import Future, TimeoutError
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class HtmlPdfWorker:
+    """Keeps one Node.js converter process, and its browser, running between conversions"""
+
+    def __init__(self, converter_dir: str):
+        self.converter_dir = converter_dir
+        self.timeout = Config.HTML_TO_PDF_TIMEOUT
+        self._process = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Keeps request lines whole; separate so a slow write never holds up replies
+        self._write_lock = threading.Lock()
+
+    def _ensure_process(self):
+        """Start the worker process if it is not running (caller holds the lock)"""
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+
+        # Started lazily so preloaded gunicorn masters never own a browser
+        self._process = subprocess.Popen(
+            ['node', 'worker.js'],
+            cwd=self.converter_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        threading.Thread(target=self._read_replies, args=(self._process,), daemon=True).start()
+        logger.info(f"Started HTML to PDF worker (pid {self._process.pid})")
+        return self._process
+
+    def _read_replies(self, process):
+        """Hand each reply line to the conversion waiting on it"""
+        for line in process.stdout:
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            with self._lock:
+                entry = self._pending.pop(reply.get('id'), None)
+            if entry is not None:
+                entry[1].set_result(reply)
+
+        # The process exited; fail whatever was still waiting on it
+        with self._lock:
+            orphaned = [request_id for request_id, entry in self._pending.items() if entry[0] is process]
+            futures = [self._pending.pop(request_id)[1] for request_id in orphaned]
+        for future in futures:
+            future.set_exception(RuntimeError('HTML to PDF worker exited'))
+
+    def convert(self, html_content: str, output_path: str, options: dict) -> dict:
+        """Convert HTML to a PDF file, returning the converter's result dict"""
+        future = Future()
+        with self._lock:
+            process = self._ensure_process()
+            request_id = next(self._ids)
+            self._pending[request_id] = (process, future)
+        
+        # A large document, or a full pipe while node is busy, can block this
+        # write; only other writers wait for it, not replies or new requests
+        request_line = json.dumps({
+            'id': request_id,
+            'html': html_content,
+            'outputPath': output_path,
+            'options': options
+        }) + '\n'
+        try:
+            with self._write_lock:
+                process.stdin.write(request_line)
+                process.stdin.flush()
+        except (OSError, ValueError) as e:
+            # The process exited, or was stopped, before the request was written
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise OSError(f"HTML to PDF worker is not accepting requests: {e}") from e
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # A hung browser would stall every later request; start over next time.
+            # Conversions still in flight on this process fail with a RuntimeError
+            # when it exits, and callers retry those in a one-off process
+            with self._lock:
+                self._pending.pop(request_id, None)
+                others = sum(1 for entry in self._pending.values() if entry[0] is process)
+            logger.error(f"HTML to PDF worker timed out, restarting it ({others} other conversions retried)")
+            process.kill()
+            return {'success': False, 'error': 'Conversion timed out'}
+
+    def stop(self):
+        """Shut the worker process down"""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.stdin.close()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
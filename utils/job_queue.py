@@ -0,0 +1,67 @@
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class JobQueue:
+    """Runs conversions in the background and tracks their status"""
+
+    def __init__(self):
+        self.max_workers = Config.JOB_WORKERS
+        self.result_ttl = Config.JOB_RESULT_TTL
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='conversion')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, func, *args, metadata: dict = None, **kwargs) -> str:
+        """Queue a job and return its id"""
+        future = self.executor.submit(func, *args, **kwargs)
+        with self._lock:
+            self._prune_finished_jobs()
+            self._jobs[job_id] = {
+                'future': future,
+                'metadata': metadata or {},
+                'submitted_at': time.time()
+            }
+        logger.info(f"Job queued: {job_id}")
+        return job_id
+
+    def get_status(self, job_id: str) -> dict:
+        """Get the state of a job, or None if it is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if job is None:
+            return None
+
+        future = job['future']
+        status = {'job_id': job_id, 'metadata': job['metadata']}
+
+        if not future.done():
+            status['state'] = 'running' if future.running() else 'pending'
+        elif future.exception() is not None:
+            status['state'] = 'failed'
+            status['error'] = str(future.exception())
+        else:
+            result = future.result()
+            status['state'] = 'finished' if result.get('success') else 'failed'
+            status['result'] = result
+            if not result.get('success'):
+                status['error'] = result.get('error', 'Conversion failed')
+
+        return status
+
+    def _prune_finished_jobs(self):
+        """Forget finished jobs older than the result TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['future'].done() and job['submitted_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting jobs and release the worker threads"""
+        self.executor.shutdown(wait=wait)
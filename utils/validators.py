@@ -1,16 +1,61 @@
 import os
+import re
 import logging
-from pathlib import Path
 from config import Config
+from utils.file_handler import file_extension
 
 logger = logging.getLogger(__name__)
 
+# Leading bytes of binary formats, checked so that a mislabelled upload is
+# rejected before a converter library allocates for it
+ZIP_SIGNATURE = (b'PK\x03\x04',)
+FILE_SIGNATURES = {
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'gif': (b'GIF87a', b'GIF89a'),
+    'bmp': (b'BM',),
+    'tif': (b'II*\x00', b'MM\x00*'),
+    'tiff': (b'II*\x00', b'MM\x00*'),
+    'ico': (b'\x00\x00\x01\x00',),
+    'webp': (b'RIFF',),
+    'pdf': (b'%PDF-',),
+    'docx': ZIP_SIGNATURE,
+    'xlsx': ZIP_SIGNATURE,
+    'pptx': ZIP_SIGNATURE,
+    'zip': ZIP_SIGNATURE
+}
+# Readers accept a PDF header anywhere in the first kilobyte
+SIGNATURE_READ_SIZE = 1024
+
+# Filename fragments rejected by _validate_security, matched in one pass
+SUSPICIOUS_FILENAME_RE = re.compile('|'.join(map(re.escape, (
+    '..',  # Directory traversal
+    '.cmd.', '.com.', '.bat.', '.exe.', '.dll.', '.vbs.', '.js.',  # Executable extensions
+    'cmd.exe', 'command.com', 'autoexec.bat'  # Specific dangerous files
+))))
+
+# Category, MAX_FILE_SIZES key and extensions of each format group; an
+# extension listed in two groups belongs to the first
+FORMAT_GROUPS = (
+    ('image', 'images', ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg')),
+    ('document', 'documents', ('pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm')),
+    ('spreadsheet', 'spreadsheets', ('xlsx', 'xls', 'csv')),
+    ('presentation', 'presentations', ('pptx', 'ppt')),
+    ('data', 'data', ('json', 'xml')),
+    ('archive', 'archives', ('zip', 'rar', '7z', 'tar', 'gz')),
+    ('audio', 'audio', ('mp3', 'wav', 'flac', 'aac', 'ogg')),
+    ('video', 'video', ('mp4', 'avi', 'mov', 'wmv', 'flv', 'mkv', 'webm')),
+    ('code', 'code', ('py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs',
+                      'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml'))
+)
+
 class FileValidator:
     """Validates uploaded files for safety and compatibility"""
     
     def __init__(self):
         # Universal supported formats - Expanded for maximum compatibility
-        self.ALLOWED_EXTENSIONS = {
+        self.ALLOWED_EXTENSIONS = frozenset({
             # Images
             'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg',
             
@@ -40,7 +85,7 @@ class FileValidator:
             
             # Other common formats
             'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml'
-        }
+        })
         
         # File size limits (in bytes) - Enhanced limits
         self.MAX_FILE_SIZES = {
@@ -55,19 +100,37 @@ class FileValidator:
             'code': 10 * 1024 * 1024,         # 10MB for code files
             'default': 500 * 1024 * 1024      # 500MB default
         }
+        
+        # Per-extension category and size limit, looked up on every validation
+        self._extension_categories = {}
+        self._extension_max_sizes = {}
+        for category, size_key, extensions in FORMAT_GROUPS:
+            for extension in extensions:
+                self._extension_categories.setdefault(extension, category)
+                self._extension_max_sizes.setdefault(extension, self.MAX_FILE_SIZES[size_key])
+        
+        # The format tables are static, so build the public views of them once
+        self._allowed_extensions_text = ", ".join(sorted(self.ALLOWED_EXTENSIONS))
+        self._supported_formats = self._build_supported_formats()
+        self._supported_formats_text = ", ".join(sorted({
+            fmt for formats in self._supported_formats.values() for fmt in formats
+        }))
     
     def is_allowed_file(self, filename: str) -> bool:
         """Check if file extension is allowed"""
         if not filename:
             return False
         
-        extension = Path(filename).suffix[1:].lower()
-        return extension in self.ALLOWED_EXTENSIONS
+        # Same result as Path(filename).suffix without building a path object
+        stem, dot, extension = filename.rpartition('.')
+        return bool(dot and stem) and extension.lower() in self.ALLOWED_EXTENSIONS
     
     def validate_file(self, file_path: str, original_filename: str = None) -> dict:
         """Comprehensive file validation"""
         try:
-            if not os.path.exists(file_path):
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
                 return {
                     'valid': False,
                     'error': 'File does not exist',
@@ -75,18 +138,17 @@ class FileValidator:
                 }
             
             # Get file extension
-            file_ext = Path(file_path).suffix[1:].lower()
+            file_ext = file_extension(file_path)
             
             # Validate extension
             if file_ext not in self.ALLOWED_EXTENSIONS:
                 return {
                     'valid': False,
                     'error': 'Unsupported file format',
-                    'details': f'File format .{file_ext} is not supported. Supported formats: {", ".join(sorted(self.ALLOWED_EXTENSIONS))}'
+                    'details': f'File format .{file_ext} is not supported. Supported formats: {self._allowed_extensions_text}'
                 }
             
             # Validate file size
-            file_size = os.path.getsize(file_path)
             max_size = self._get_max_size_for_format(file_ext)
             
             if file_size > max_size:
@@ -101,6 +163,15 @@ class FileValidator:
             if not security_check['valid']:
                 return security_check
             
+            # Content must match the claimed format
+            if not self._matches_signature(file_path, file_ext):
+                return {
+                    'valid': False,
+                    'error': 'File content does not match its extension',
+                    'details': f'The uploaded file is not a valid .{file_ext} file.',
+                    'status_code': 415
+                }
+            
             # Determine file category
             category = self._get_file_category(file_ext)
             
@@ -121,28 +192,25 @@ class FileValidator:
                 'details': f'An error occurred during file validation: {str(e)}'
             }
     
+    def _matches_signature(self, file_path: str, extension: str) -> bool:
+        """Check a file's leading bytes against the signature of its format"""
+        signatures = FILE_SIGNATURES.get(extension)
+        if signatures is None:
+            # Text formats and formats without a fixed header are not checked
+            return True
+        
+        with open(file_path, 'rb') as f:
+            head = f.read(SIGNATURE_READ_SIZE)
+        
+        if extension == 'pdf':
+            return signatures[0] in head
+        if extension == 'webp':
+            return head[:4] == b'RIFF' and head[8:12] == b'WEBP'
+        return head.startswith(signatures)
+    
     def _get_max_size_for_format(self, extension: str) -> int:
         """Get maximum file size for a given format"""
-        if extension in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg']:
-            return self.MAX_FILE_SIZES['images']
-        elif extension in ['pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm']:
-            return self.MAX_FILE_SIZES['documents']
-        elif extension in ['xlsx', 'xls', 'csv']:
-            return self.MAX_FILE_SIZES['spreadsheets']
-        elif extension in ['pptx', 'ppt']:
-            return self.MAX_FILE_SIZES['presentations']
-        elif extension in ['json', 'xml']:
-            return self.MAX_FILE_SIZES['data']
-        elif extension in ['zip', 'rar', '7z', 'tar', 'gz']:
-            return self.MAX_FILE_SIZES['archives']
-        elif extension in ['mp3', 'wav', 'flac', 'aac', 'ogg']:
-            return self.MAX_FILE_SIZES['audio']
-        elif extension in ['mp4', 'avi', 'mov', 'wmv', 'flv', 'mkv', 'webm']:
-            return self.MAX_FILE_SIZES['video']
-        elif extension in ['py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml']:
-            return self.MAX_FILE_SIZES['code']
-        else:
-            return self.MAX_FILE_SIZES['default']
+        return self._extension_max_sizes.get(extension, self.MAX_FILE_SIZES['default'])
     
     def _validate_security(self, file_path: str) -> dict:
         """Basic security validation"""
@@ -157,20 +225,13 @@ class FileValidator:
             
             # Check for suspicious filename patterns
             filename = os.path.basename(file_path).lower()
-            # More specific patterns to avoid false positives
-            suspicious_patterns = [
-                '..',  # Directory traversal
-                '.cmd.', '.com.', '.bat.', '.exe.', '.dll.', '.vbs.', '.js.',  # Executable extensions
-                'cmd.exe', 'command.com', 'autoexec.bat'  # Specific dangerous files
-            ]
-            
-            for pattern in suspicious_patterns:
-                if pattern in filename:
-                    return {
-                        'valid': False,
-                        'error': 'Security violation',
-                        'details': f'Filename contains suspicious pattern: {pattern}'
-                    }
+            match = SUSPICIOUS_FILENAME_RE.search(filename)
+            if match:
+                return {
+                    'valid': False,
+                    'error': 'Security violation',
+                    'details': f'Filename contains suspicious pattern: {match.group()}'
+                }
             
             return {'valid': True}
             
@@ -184,26 +245,7 @@ class FileValidator:
     
     def _get_file_category(self, extension: str) -> str:
         """Get file category based on extension"""
-        if extension in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg']:
-            return 'image'
-        elif extension in ['pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm']:
-            return 'document'
-        elif extension in ['xlsx', 'xls', 'csv']:
-            return 'spreadsheet'
-        elif extension in ['pptx', 'ppt']:
-            return 'presentation'
-        elif extension in ['json', 'xml']:
-            return 'data'
-        elif extension in ['zip', 'rar', '7z', 'tar', 'gz']:
-            return 'archive'
-        elif extension in ['mp3', 'wav', 'flac', 'aac', 'ogg']:
-            return 'audio'
-        elif extension in ['mp4', 'avi', 'mov', 'wmv', 'flv', 'mkv', 'webm']:
-            return 'video'
-        elif extension in ['py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml']:
-            return 'code'
-        else:
-            return 'unknown'
+        return self._extension_categories.get(extension, 'unknown')
     
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
@@ -211,26 +253,24 @@ class FileValidator:
             return "0B"
         
         size_names = ["B", "KB", "MB", "GB"]
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
+        # Each unit is 2**10 of the one before, so the bit length picks it
+        i = min((size_bytes.bit_length() - 1) // 10, len(size_names) - 1)
+        s = round(size_bytes / (1 << (10 * i)), 2)
         return f"{s} {size_names[i]}"
     
     def get_supported_formats(self) -> dict:
         """Get information about supported formats"""
-        return {
-            'image_formats': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'tif', 'webp', 'ico', 'svg'],
-            'document_formats': ['pdf', 'txt', 'docx', 'doc', 'rtf', 'md', 'html', 'htm'],
-            'spreadsheet_formats': ['xlsx', 'xls', 'csv'],
-            'presentation_formats': ['pptx', 'ppt'],
-            'data_formats': ['json', 'xml'],
-            'archive_formats': ['zip', 'rar', '7z', 'tar', 'gz'],
-            'audio_formats': ['mp3', 'wav', 'flac', 'aac', 'ogg'],
-            'video_formats': ['mp4', 'avi', 'mov', 'wmv', 'flv', 'mkv', 'webm'],
-            'code_formats': ['py', 'js', 'css', 'php', 'java', 'cpp', 'c', 'cs', 'rb', 'go', 'rs', 'log', 'ini', 'cfg', 'conf', 'yaml', 'yml', 'toml'],
-            'all_formats': sorted(list(self.ALLOWED_EXTENSIONS))
-        }
+        return self._supported_formats
+    
+    def get_supported_formats_text(self) -> str:
+        """Get every supported extension as a sorted, comma separated string"""
+        return self._supported_formats_text
+    
+    def _build_supported_formats(self) -> dict:
+        """Build the supported formats table grouped by category"""
+        formats = {f'{category}_formats': list(extensions) for category, _, extensions in FORMAT_GROUPS}
+        formats['all_formats'] = sorted(self.ALLOWED_EXTENSIONS)
+        return formats
     
     def get_format_info(self, extension: str) -> dict:
         """Get detailed information about a specific format"""